@@ -1,9 +1,35 @@
-from typing import List
+import csv
+import io
+from datetime import datetime
+from typing import Annotated, Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 
+from app.core.config import settings
 from app.core.exceptions import DataNotFoundException
-from app.schemas.project import ProjectSchema, CreateUpdateProjectRequest
+from app.core.http_cache import cached_json, etag_matches, make_etag, not_modified
+from app.core.metrics import metrics
+from app.db.pool import get_long_held_connections
+from app.schemas.analytics import (
+    BelowThresholdParams,
+    BelowThresholdSchema,
+    KpaDistributionSchema,
+    LevelRankingSchema,
+)
+from app.schemas.export import ExportParams
+from app.schemas.history import TrendPointSchema
+from app.schemas.job import JobSchema
+from app.schemas.pagination import (
+    UserListParams,
+    ProjectListParams,
+    SheetListParams,
+)
+from app.schemas.project import (
+    ProjectSchema,
+    ProjectSummarySchema,
+    CreateUpdateProjectRequest,
+)
 from app.schemas.role import Role
 from app.schemas.sheet import SheetSchema, CreateUpdateSheetRequest
 from app.schemas.user import (
@@ -12,6 +38,7 @@ from app.schemas.user import (
     UpdateUserRequest,
     ChangeRoleRequest,
     CreateUserRequest,
+    ImportUsersResponse,
 )
 from app.core.dependencies import admin_only
 from app.services import (
@@ -20,11 +47,23 @@ from app.services import (
     role as role_service,
     sheet as sheet_service,
     project as project_service,
+    job as job_service,
+    analytics as analytics_service,
+    history as history_service,
+    export as export_service,
 )
 
 router = APIRouter(dependencies=[Depends(admin_only)])
 
 
+def next_cursor_headers(next_cursor: Optional[str]) -> dict:
+    return {} if next_cursor is None else {"X-Next-Cursor": next_cursor}
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    response.headers.update(next_cursor_headers(next_cursor))
+
+
 @router.post("/create-admin", response_model=UserSchema)
 def create_admin(payload: RegisterUserRequest):
     user = auth_service.register_user(payload, "ADMIN")
@@ -38,8 +77,10 @@ def create_moderator(payload: RegisterUserRequest):
 
 
 @router.get("/users", response_model=List[UserSchema])
-def get_users():
-    return user_service.get_users()
+def get_users(response: Response, params: Annotated[UserListParams, Query()]):
+    users, next_cursor = user_service.get_users(params)
+    set_next_cursor(response, next_cursor)
+    return users
 
 
 @router.post("/users", response_model=UserSchema)
@@ -50,6 +91,18 @@ def create_user(payload: CreateUserRequest):
     return user
 
 
+@router.post("/users/import", response_model=ImportUsersResponse)
+def import_users(payload: List[Dict[str, Any]]):
+    return auth_service.import_users(payload)
+
+
+@router.post("/users/import/csv", response_model=ImportUsersResponse)
+def import_users_csv(file: UploadFile):
+    # Columns: username, email, password, fullname, role
+    rows = csv.DictReader(io.TextIOWrapper(file.file, encoding="utf-8-sig"))
+    return auth_service.import_users(list(rows))
+
+
 @router.get("/users/{user_id}", response_model=UserSchema)
 def get_user_by_id(user_id: int):
     return user_service.get_user_by_id(user_id)
@@ -88,8 +141,10 @@ def create_sheet(payload: CreateUpdateSheetRequest):
 
 
 @router.get("/sheets", response_model=List[SheetSchema])
-def get_sheets():
-    return sheet_service.get_sheets()
+def get_sheets(response: Response, params: Annotated[SheetListParams, Query()]):
+    sheets, next_cursor = sheet_service.get_sheets(params)
+    set_next_cursor(response, next_cursor)
+    return sheets
 
 
 @router.get("/sheets/available", response_model=List[SheetSchema])
@@ -126,9 +181,39 @@ def create_project(payload: CreateUpdateProjectRequest):
     return project
 
 
-@router.get("/projects", response_model=List[ProjectSchema])
-def get_projects():
-    return project_service.get_projects()
+@router.post("/projects/calculate-scores", response_model=JobSchema)
+def calculate_all_project_scores(
+    concurrency: int | None = Query(
+        default=None, ge=1, le=settings.BULK_RECALCULATE_MAX_CONCURRENCY
+    ),
+    full_rebuild: bool = False,
+):
+    return project_service.enqueue_all_project_scores(concurrency, full_rebuild)
+
+
+@router.get(
+    "/projects",
+    response_model=List[ProjectSummarySchema],
+    response_model_exclude_unset=True,
+)
+def get_projects(request: Request, params: Annotated[ProjectListParams, Query()]):
+    projects, next_cursor = project_service.get_projects(params)
+    return cached_json(
+        request,
+        projects,
+        headers=next_cursor_headers(next_cursor),
+        exclude_unset=True,
+    )
+
+
+@router.get("/projects/export")
+def export_projects(params: Annotated[ExportParams, Query()]):
+    filename = export_service.export_filename(params)
+    return StreamingResponse(
+        export_service.export_projects(params),
+        media_type=export_service.EXPORT_MEDIA_TYPES[params.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/projects/{project_id}", response_model=ProjectSchema)
@@ -150,10 +235,66 @@ def delete_project(project_id: int):
 
 
 @router.get("/projects/{project_id}/detail")
-def get_project_detail(project_id: int):
-    return project_service.get_project_detail(project_id)
+def get_project_detail(request: Request, project_id: int):
+    freshness = project_service.revalidate_project_scores(project_id)
+    etag = make_etag(
+        *project_service.get_project_detail_version(project_id), freshness.state
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    detail = project_service.get_project_detail(project_id, freshness)
+    return cached_json(request, detail, etag=etag)
+
+
+@router.get(
+    "/projects/{project_id}/trend",
+    response_model=List[TrendPointSchema],
+    response_model_exclude_unset=True,
+)
+def get_project_trend(
+    project_id: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    full: bool = False,
+):
+    return history_service.get_project_trend(project_id, since, until, full)
+
+
+@router.get("/projects/{project_id}/calculate-scores", response_model=JobSchema)
+def calculate_project_scores(project_id: int, full_rebuild: bool = False):
+    return project_service.enqueue_project_scores(project_id, full_rebuild=full_rebuild)
+
+
+@router.get("/analytics/kpa-distribution", response_model=List[KpaDistributionSchema])
+def get_kpa_distribution():
+    return analytics_service.get_kpa_distribution()
+
+
+@router.get("/analytics/level-ranking", response_model=List[LevelRankingSchema])
+def get_level_ranking(
+    level: Optional[str] = None, limit: int | None = Query(default=None, ge=1)
+):
+    return analytics_service.get_level_ranking(level, limit)
+
+
+@router.get("/analytics/below-threshold", response_model=List[BelowThresholdSchema])
+def get_projects_below(params: Annotated[BelowThresholdParams, Query()]):
+    return analytics_service.get_projects_below(params)
+
+
+@router.get("/jobs/{job_id}", response_model=JobSchema)
+def get_job(job_id: str):
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise DataNotFoundException(entity_name="job")
+
+    return job
 
 
-@router.get("/projects/{project_id}/calculate-scores")
-def calculate_project_scores(project_id: int):
-    return project_service.calculate_project_scores(project_id)
+@router.get("/metrics")
+def get_metrics():
+    return {
+        "metrics": metrics.snapshot(),
+        "db_long_held_connections": get_long_held_connections(),
+    }
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from app.core.dependencies import get_current_user
-from app.models import User
+from app.core.http_cache import cached_json
 from app.schemas.user import (
     UserSchema,
 )
@@ -10,5 +10,5 @@ router = APIRouter()
 
 
 @router.get("/profile", response_model=UserSchema)
-def get_profile(current_user: User = Depends(get_current_user)):
-    return current_user
+def get_profile(request: Request, current_user: UserSchema = Depends(get_current_user)):
+    return cached_json(request, current_user)
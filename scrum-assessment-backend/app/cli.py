@@ -0,0 +1,42 @@
+import argparse
+import sys
+
+from app.services.project import recalculate_all_projects
+
+
+def recalculate_all(args: argparse.Namespace) -> int:
+    result = recalculate_all_projects(args.concurrency, args.full_rebuild)
+
+    for project in result["projects"]:
+        line = (
+            f"project {project['project_id']:>5}  "
+            f"{project['status']:<9}  {project['elapsed']:>8.3f}s"
+        )
+        if project["error"]:
+            line += f"  {project['error']}"
+        print(line)
+
+    print(
+        f"{result['succeeded']}/{result['total']} projects recalculated "
+        f"in {result['elapsed']:.3f}s (concurrency {result['concurrency']})"
+    )
+    return 1 if result["failed"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recalculate = commands.add_parser(
+        "recalculate-all", help="Recalculate the scores of every project"
+    )
+    recalculate.add_argument("--concurrency", type=int, default=None)
+    recalculate.add_argument("--full-rebuild", action="store_true")
+    recalculate.set_defaults(handler=recalculate_all)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
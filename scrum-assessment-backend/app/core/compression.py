@@ -0,0 +1,256 @@
+import time
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional
+    zstandard = None
+
+# Already compressed formats (xlsx, parquet, images) gain nothing
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> Dict[str, Callable]:
+    """
+    Compressor factories for settings.COMPRESSION_ENCODINGS, in server
+    preference order, skipping those whose library is not installed.
+    """
+    factories = {
+        "gzip": lambda: GzipCompressor(settings.COMPRESSION_GZIP_LEVEL),
+    }
+    if brotli is not None:
+        factories["br"] = lambda: BrotliCompressor(settings.COMPRESSION_BROTLI_QUALITY)
+    if zstandard is not None:
+        factories["zstd"] = lambda: ZstdCompressor(settings.COMPRESSION_ZSTD_LEVEL)
+
+    return {
+        encoding: factories[encoding]
+        for encoding in settings.COMPRESSION_ENCODINGS
+        if encoding in factories
+    }
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+
+    return accepted
+
+
+def negotiate_encoding(header: str, supported: List[str]) -> Optional[str]:
+    """
+    Highest q-value coding of Accept-Encoding that the server supports, ties
+    going to the server preference order of `supported`.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compresses HTTP responses with the best encoding the client accepts.
+    Bodies sent in one message below settings.COMPRESSION_MIN_SIZE are left
+    alone. Streamed bodies are flushed to the client every
+    settings.COMPRESSION_STREAM_FLUSH_SIZE input bytes, so rows keep arriving
+    without flushing the compressor on every small chunk.
+    """
+
+    def __init__(self, app, min_size: int | None = None):
+        self.app = app
+        self.min_size = settings.COMPRESSION_MIN_SIZE if min_size is None else min_size
+        self.flush_size = settings.COMPRESSION_STREAM_FLUSH_SIZE
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        encoding = negotiate_encoding(
+            headers.get(b"accept-encoding", b"").decode("latin-1"),
+            list(self.encodings),
+        )
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        responder = CompressionResponder(
+            send, encoding, self.encodings[encoding], self.min_size, self.flush_size
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(self, send, encoding: str, factory, min_size: int, flush_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.factory = factory
+        self.min_size = min_size
+        self.flush_size = flush_size
+        self.unflushed = 0
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+
+    def should_compress(self, message: dict, body: bytes, more_body: bool) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+
+        headers = {k.lower(): v for k, v in message.get("headers", [])}
+        if b"content-encoding" in headers:
+            return False
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+
+        return more_body or len(body) >= self.min_size
+
+    def start_headers(self) -> list:
+        headers = []
+        vary = None
+        for name, value in self.start_message.get("headers", []):
+            lowered = name.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"etag" and not value.startswith(b"W/"):
+                # The representation differs from the identity one
+                value = b"W/" + value
+            if lowered == b"vary":
+                vary = value
+                continue
+            headers.append((name, value))
+
+        vary = b"Accept-Encoding" if vary is None else vary + b", Accept-Encoding"
+        headers.append((b"vary", vary))
+        headers.append((b"content-encoding", self.encoding.encode()))
+        return headers
+
+    async def send(self, message: dict):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            return await self._send(message)
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            if not self.should_compress(self.start_message, body, more_body):
+                self.passthrough = True
+                await self._send(self.start_message)
+                return await self._send(message)
+
+            self.compressor = self.factory()
+            await self._send({**self.start_message, "headers": self.start_headers()})
+
+        start = time.perf_counter()
+        compressed = self.compressor.compress(body)
+        self.unflushed += len(body)
+        if not more_body:
+            compressed += self.compressor.finish()
+        elif self.unflushed >= self.flush_size:
+            compressed += self.compressor.flush()
+            self.unflushed = 0
+        self.seconds += time.perf_counter() - start
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+
+        if compressed or not more_body:
+            await self._send(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
+        if not more_body:
+            self.record()
+
+    def record(self):
+        metrics.counter(f"http_compression_{self.encoding}_responses_total").inc()
+        metrics.counter(f"http_compression_{self.encoding}_bytes_in_total").inc(
+            self.bytes_in
+        )
+        metrics.counter(f"http_compression_{self.encoding}_bytes_out_total").inc(
+            self.bytes_out
+        )
+        metrics.histogram("http_compression_seconds").observe(self.seconds)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 GSHEET_COLUMNS = {
     "Adanya peran Scrum": ["E", "G"],
@@ -22,6 +23,13 @@ GSHEET_COLUMNS = {
     "Indikator positif": ["BU", "BV"],
 }
 
+# Whole response block of "Form Responses 1": members (C) up to the last
+# question column, fetched in a single read and sliced per section locally.
+GSHEET_RESPONSE_RANGE = ["C", "BV"]
+GSHEET_MEMBER_COLUMN = "C"
+# Submission time, rewritten by Google Forms when a response is edited
+GSHEET_TIMESTAMP_COLUMN = "A"
+
 SECTION_GROUPS = {
     "Basic Scrum Management": [
         "Adanya peran Scrum",
@@ -83,14 +91,105 @@ class Settings:
     PROJECT_NAME = "Scrum Assessment Backend"
     GSHEET_COLUMNS = GSHEET_COLUMNS
     DATABASE_URL = os.environ.get("DATABASE_URL")
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Connections checked out for longer than this are logged and counted
+    DB_LONG_HELD_SECONDS = float(os.environ.get("DB_LONG_HELD_SECONDS", 10))
     MAIN_ADMIN = MainAdmin()
     SECRET_KEY = os.environ.get("SECRET_KEY")
     ALGORITHM = os.environ.get("ALGORITHM")
+    # bcrypt runs on its own process pool with bounded backpressure. Callers
+    # wait for a hash slot with no database session open, so
+    # PASSWORD_HASH_MAX_PENDING is independent of DB_POOL_SIZE +
+    # DB_MAX_OVERFLOW; hashing while holding a connection would need it to
+    # stay below that total to avoid starving other requests.
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 16))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(
+        os.environ.get("PASSWORD_HASH_QUEUE_TIMEOUT", 5)
+    )
+    # Longest a hash may take once queued on the pool, before 503
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))
+    PRINCIPAL_CACHE_SIZE = int(os.environ.get("PRINCIPAL_CACHE_SIZE", 1024))
+    PRINCIPAL_CACHE_TTL = int(os.environ.get("PRINCIPAL_CACHE_TTL", 60))
 
     base_path = os.path.dirname(os.path.abspath(__file__))
     GSHEET_ACCOUNT_CREDENTIALS_FILE = os.path.join(
         base_path, os.environ.get("GSHEET_ACCOUNT_CREDENTIALS_FILE")
     )
+    GSHEET_HTTP_POOL_SIZE = int(os.environ.get("GSHEET_HTTP_POOL_SIZE", 10))
+    GSHEET_KEY_CACHE_SIZE = int(os.environ.get("GSHEET_KEY_CACHE_SIZE", 1024))
+    GSHEET_KEY_CACHE_TTL = int(os.environ.get("GSHEET_KEY_CACHE_TTL", 3600))
+    # Shared by every worker on the host, sized to the Sheets per-minute quota
+    GSHEET_RATE_LIMIT_PER_MINUTE = int(
+        os.environ.get("GSHEET_RATE_LIMIT_PER_MINUTE", 60)
+    )
+    GSHEET_RATE_LIMIT_BURST = int(os.environ.get("GSHEET_RATE_LIMIT_BURST", 10))
+    GSHEET_RATE_LIMIT_STATE_FILE = os.environ.get(
+        "GSHEET_RATE_LIMIT_STATE_FILE",
+        os.path.join(tempfile.gettempdir(), "scrum-assessment-gsheet-bucket.json"),
+    )
+    GSHEET_MAX_RETRIES = int(os.environ.get("GSHEET_MAX_RETRIES", 5))
+    GSHEET_BACKOFF_BASE = float(os.environ.get("GSHEET_BACKOFF_BASE", 1.0))
+    GSHEET_BACKOFF_MAX = float(os.environ.get("GSHEET_BACKOFF_MAX", 32.0))
+
+    # Response compression, in server preference order; br and zstd are only
+    # offered when Brotli and zstandard are installed
+    COMPRESSION_ENCODINGS = os.environ.get(
+        "COMPRESSION_ENCODINGS", "zstd,br,gzip"
+    ).split(",")
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 4))
+    COMPRESSION_ZSTD_LEVEL = int(os.environ.get("COMPRESSION_ZSTD_LEVEL", 3))
+    COMPRESSION_STREAM_FLUSH_SIZE = int(
+        os.environ.get("COMPRESSION_STREAM_FLUSH_SIZE", 64 * 1024)
+    )
+
+    PAGE_SIZE_DEFAULT = int(os.environ.get("PAGE_SIZE_DEFAULT", 100))
+    PAGE_SIZE_MAX = int(os.environ.get("PAGE_SIZE_MAX", 500))
+
+    # CSV/Parquet response files for sheets with source_type "file"
+    RESPONSE_FILES_DIR = os.environ.get("RESPONSE_FILES_DIR", "data")
+
+    # Score history: every snapshot is kept for SNAPSHOT_KEEP_ALL_DAYS, then
+    # the last one per day until SNAPSHOT_KEEP_DAILY_DAYS, then one per month
+    SNAPSHOT_KEEP_ALL_DAYS = int(os.environ.get("SNAPSHOT_KEEP_ALL_DAYS", 30))
+    SNAPSHOT_KEEP_DAILY_DAYS = int(os.environ.get("SNAPSHOT_KEEP_DAILY_DAYS", 365))
+
+    # Scores older than this are served while a refresh runs in the background
+    SCORE_MAX_AGE = int(os.environ.get("SCORE_MAX_AGE", 3600))
+    # How long the detail endpoint waits for scores never calculated before
+    SCORE_WAIT_TIMEOUT = float(os.environ.get("SCORE_WAIT_TIMEOUT", 30))
+    # Seconds after a failed recalculation before views start another one
+    SCORE_RETRY_BACKOFF = int(os.environ.get("SCORE_RETRY_BACKOFF", 300))
+
+    # Rows per written chunk and projects per page fetched by exports
+    EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 500))
+    EXPORT_PROJECTS_PER_FETCH = int(os.environ.get("EXPORT_PROJECTS_PER_FETCH", 50))
+
+    JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+    JOB_RETENTION_SECONDS = int(os.environ.get("JOB_RETENTION_SECONDS", 3600))
+    # Jobs and their single-flight keys are tracked in process memory, so only
+    # one server process may run; it holds an exclusive lock on this file
+    JOB_WORKER_LOCK_FILE = os.environ.get(
+        "JOB_WORKER_LOCK_FILE",
+        os.path.join(tempfile.gettempdir(), "scrum-assessment-jobs.lock"),
+    )
+    BULK_RECALCULATE_CONCURRENCY = int(
+        os.environ.get("BULK_RECALCULATE_CONCURRENCY", 4)
+    )
+    # Each thread holds a connection while saving, keep part of the pool for
+    # requests
+    BULK_RECALCULATE_MAX_CONCURRENCY = max(1, DB_POOL_SIZE + DB_MAX_OVERFLOW - 5)
+    # How long a bulk run waits on a recalculation of a project already in
+    # flight before reporting that project as failed
+    BULK_RECALCULATE_WAIT_TIMEOUT = float(
+        os.environ.get("BULK_RECALCULATE_WAIT_TIMEOUT", 300)
+    )
 
 
 settings = Settings()
@@ -4,7 +4,7 @@ from jose import JWTError
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 
-from app.models.user import User
+from app.core.principal_cache import principal_cache
 from app.core.security import decode_access_token
 from app.schemas.user import UserSchema
 from app.services.auth import get_user_by_username_or_email
@@ -13,7 +13,7 @@ from app.services.auth import get_user_by_username_or_email
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")  # or /token
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+def get_current_user(token: str = Depends(oauth2_scheme)) -> UserSchema:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,16 +29,23 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     except JWTError:
         raise credentials_exception
 
+    user = principal_cache.get(username)
+    if user is not None:
+        return user
+
+    generation = principal_cache.generation
     user = get_user_by_username_or_email(username)
     if user is None:
         raise credentials_exception
 
+    user = UserSchema.model_validate(user)
+    principal_cache.set(username, user, generation)
+
     return user
 
 
 def admin_only(token: str = Depends(oauth2_scheme)) -> UserSchema | None:
     user = get_current_user(token)
-    user = UserSchema.model_validate(user)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -8,3 +8,18 @@ class DataNotFoundException(Exception):
     def __init__(self, entity_name: str, detail: str = "Data not found"):
         self.entity_name = entity_name
         self.detail = detail
+
+
+class ServiceBusyException(Exception):
+    def __init__(self, detail: str = "Service busy, try again later"):
+        self.detail = detail
+
+
+class InvalidParameterException(Exception):
+    def __init__(self, detail: str = "Invalid parameter"):
+        self.detail = detail
+
+
+class ScoreCalculationException(Exception):
+    def __init__(self, detail: str = "Score calculation failed"):
+        self.detail = detail
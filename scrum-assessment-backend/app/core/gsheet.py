@@ -1,22 +1,163 @@
+import threading
+import time
+
 import gspread
+import requests
 
+from cachetools import TTLCache
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
+from gspread.exceptions import APIError, SpreadsheetNotFound
+from gspread.http_client import HTTPClient
+from gspread.urls import DRIVE_FILES_API_V3_URL
+from requests.adapters import HTTPAdapter
 from app.core.config import Settings
+from app.core.ratelimit import FileTokenBucket, backoff_delay
 
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
 
-def get_google_sheet_file(filename: str):
-    # Load service account credentials
-    SCOPES = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+google_api_bucket = FileTokenBucket(
+    Settings.GSHEET_RATE_LIMIT_STATE_FILE,
+    capacity=Settings.GSHEET_RATE_LIMIT_BURST,
+    refill_per_second=Settings.GSHEET_RATE_LIMIT_PER_MINUTE / 60,
+)
+
+
+class ScheduledHTTPClient(HTTPClient):
+    """
+    gspread HTTP client that takes a token from the shared bucket before every
+    Sheets/Drive request and retries 429/5xx and connection errors with
+    exponential backoff and jitter.
+    """
+
+    def request(self, *args, **kwargs):
+        attempt = 0
+        while True:
+            google_api_bucket.acquire()
+            try:
+                return super().request(*args, **kwargs)
+            except APIError as e:
+                status_code = e.response.status_code
+                if (
+                    status_code not in RETRYABLE_STATUS_CODES
+                    or attempt >= Settings.GSHEET_MAX_RETRIES
+                ):
+                    raise
+                retry_after = e.response.headers.get("Retry-After", "")
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= Settings.GSHEET_MAX_RETRIES:
+                    raise
+                retry_after = ""
+
+            delay = backoff_delay(
+                attempt, Settings.GSHEET_BACKOFF_BASE, Settings.GSHEET_BACKOFF_MAX
+            )
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+
+            time.sleep(delay)
+            attempt += 1
+
+
+class GoogleSheetClientManager:
+    """
+    Process-wide gspread client. Credentials are authorized once and the
+    AuthorizedSession refreshes the token in place over one pooled HTTP
+    session. Spreadsheet keys are cached by filename so opening a known file
+    skips the Drive search by title.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+        self._keys = TTLCache(
+            maxsize=Settings.GSHEET_KEY_CACHE_SIZE, ttl=Settings.GSHEET_KEY_CACHE_TTL
+        )
+
+    def get_client(self) -> gspread.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._authorize()
+
+        return self._client
+
+    def _authorize(self) -> gspread.Client:
+        creds = Credentials.from_service_account_file(
+            Settings.GSHEET_ACCOUNT_CREDENTIALS_FILE, scopes=SCOPES
+        )
+
+        session = AuthorizedSession(creds)
+        adapter = HTTPAdapter(
+            pool_connections=Settings.GSHEET_HTTP_POOL_SIZE,
+            pool_maxsize=Settings.GSHEET_HTTP_POOL_SIZE,
+        )
+        session.mount("https://", adapter)
 
-    creds = Credentials.from_service_account_file(
-        Settings.GSHEET_ACCOUNT_CREDENTIALS_FILE, scopes=SCOPES
-    )
+        return gspread.Client(
+            auth=creds, session=session, http_client=ScheduledHTTPClient
+        )
 
-    # Authorize with gspread
-    client = gspread.authorize(creds)
+    def open(self, filename: str) -> gspread.Spreadsheet:
+        client = self.get_client()
 
-    file = client.open(filename)
-    return file
+        with self._lock:
+            key = self._keys.get(filename)
+
+        if key is not None:
+            try:
+                return client.open_by_key(key)
+            except SpreadsheetNotFound:
+                self.invalidate(filename)
+
+        file = client.open(filename)
+        with self._lock:
+            self._keys[filename] = file.id
+
+        return file
+
+    def get_drive_version(self, filename: str) -> str:
+        """
+        Drive version and modifiedTime of the file, which change on every
+        edit including new form submissions. A single Drive call when the
+        key is cached.
+        """
+        with self._lock:
+            key = self._keys.get(filename)
+
+        if key is None:
+            key = self.open(filename).id
+
+        try:
+            metadata = self._drive_metadata(key)
+        except APIError as e:
+            if e.response.status_code != 404:
+                raise
+            self.invalidate(filename)
+            metadata = self._drive_metadata(self.open(filename).id)
+
+        return f"{metadata['version']}:{metadata['modifiedTime']}"
+
+    def _drive_metadata(self, key: str) -> dict:
+        response = self.get_client().http_client.request(
+            "get",
+            f"{DRIVE_FILES_API_V3_URL}/{key}",
+            params={"supportsAllDrives": True, "fields": "version,modifiedTime"},
+        )
+        return response.json()
+
+    def invalidate(self, filename: str):
+        with self._lock:
+            self._keys.pop(filename, None)
+
+
+gsheet_client = GoogleSheetClientManager()
+
+
+def get_google_sheet_file(filename: str):
+    return gsheet_client.open(filename)
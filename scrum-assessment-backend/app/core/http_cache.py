@@ -0,0 +1,64 @@
+import hashlib
+
+from fastapi import Request, Response
+
+from app.core.serialization import dump_json
+
+# Responses depend on the bearer token, so shared caches must not reuse them
+# and clients revalidate with If-None-Match on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("\x1f".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def body_etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Weak comparison of If-None-Match against `etag`, as RFC 9110 requires
+    for GET and HEAD.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+def cached_json(
+    request: Request,
+    content,
+    etag: str | None = None,
+    headers: dict | None = None,
+    exclude_unset: bool = False,
+) -> Response:
+    """
+    Render `content` as JSON with validator headers, or answer 304 when the
+    client already has it. Without `etag` the body hash is used.
+    """
+    body = dump_json(content, exclude_unset=exclude_unset)
+    etag = etag or body_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    return Response(
+        body,
+        media_type="application/json",
+        headers={**(headers or {}), **cache_headers(etag)},
+    )
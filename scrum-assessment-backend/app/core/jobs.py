@@ -0,0 +1,164 @@
+import fcntl
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime, UTC
+from typing import Callable, Dict, Optional
+from uuid import uuid4
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class Job:
+    def __init__(self, key: str):
+        self.id = uuid4().hex
+        self.key = key
+        self.status = JobStatus.PENDING
+        self.stage: Optional[str] = None
+        self.progress: float = 0.0
+        self.result = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(UTC)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._done = threading.Event()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+
+_current_job: ContextVar[Optional[Job]] = ContextVar("current_job", default=None)
+
+
+def update_job_progress(stage: str, progress: float | None = None):
+    """
+    Report progress of the running job, a no-op outside of a job.
+    """
+    job = _current_job.get()
+    if job is None:
+        return
+
+    job.stage = stage
+    if progress is not None:
+        job.progress = progress
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded worker pool. Jobs are single-flight per key:
+    submitting a key that is already pending or running joins that job.
+    Finished jobs are kept for a while so their status can be polled.
+    """
+
+    def __init__(self, max_workers: int, retention: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job"
+        )
+        self._lock = threading.Lock()
+        self._jobs = TTLCache(maxsize=10_000, ttl=retention)
+        self._in_flight: Dict[str, Job] = {}
+
+    def submit(self, key: str, func: Callable, *args, **kwargs) -> Job:
+        with self._lock:
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job
+
+            job = Job(key)
+            self._in_flight[key] = job
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def run(self, key: str, func: Callable, *args, timeout=None, **kwargs) -> Job:
+        """
+        Run `func` in the calling thread as the job for `key`, registered in
+        flight so that submits of the same key join it. When the key is
+        already in flight, wait up to `timeout` seconds for that job instead.
+        """
+        with self._lock:
+            job = self._in_flight.get(key)
+            owner = job is None
+            if owner:
+                job = Job(key)
+                self._in_flight[key] = job
+                self._jobs[job.id] = job
+
+        if owner:
+            self._run(job, func, args, kwargs)
+        elif not job.wait(timeout):
+            raise TimeoutError(f"Job {job.key} still running after {timeout} s")
+
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = next(
+                    (j for j in self._in_flight.values() if j.id == job_id), None
+                )
+
+        return job
+
+    def get_in_flight(self, key: str) -> Job | None:
+        with self._lock:
+            return self._in_flight.get(key)
+
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: dict):
+        token = _current_job.set(job)
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(UTC)
+        try:
+            # Every service call opens and closes its own session, so no
+            # connection is held across the network waits of a job
+            job.result = func(*args, **kwargs)
+            job.progress = 1.0
+            job.status = JobStatus.SUCCEEDED
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.key)
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now(UTC)
+            _current_job.reset(token)
+            with self._lock:
+                self._in_flight.pop(job.key, None)
+                self._jobs[job.id] = job
+            job._done.set()
+
+
+def acquire_worker_lock(path: str):
+    """
+    Hold an exclusive lock on `path` for the life of the process. The job
+    registry is per process: with several workers, job polls would miss and
+    the same project could be recalculated twice at once, so a second
+    server process on the host fails to start instead.
+    """
+    file = open(path, "a")
+    try:
+        fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        file.close()
+        raise RuntimeError(
+            f"{path} is locked by another server process; jobs are tracked in "
+            "process memory, run a single uvicorn worker"
+        )
+
+    return file
+
+
+job_manager = JobManager(settings.JOB_WORKERS, settings.JOB_RETENTION_SECONDS)
@@ -0,0 +1,94 @@
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List
+
+
+class Counter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    """
+    Gauge read from a callback when the metrics are collected.
+    """
+
+    def __init__(self, read: Callable[[], float]):
+        self.read = read
+
+    def snapshot(self):
+        return self.read()
+
+
+class Histogram:
+    def __init__(self, buckets: List[float]):
+        self._lock = threading.Lock()
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.sum, self.count
+
+        # Cumulative counts per upper bound, like Prometheus "le" buckets
+        cumulative = {}
+        running = 0
+        for bound, n in zip(self.buckets + ["+Inf"], counts):
+            running += n
+            cumulative[str(bound)] = running
+
+        return {"count": count, "sum": round(total, 6), "buckets": cumulative}
+
+
+LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Counter | Gauge | Histogram] = {}
+
+    def _register(self, name: str, factory: Callable):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def counter(self, name: str) -> Counter:
+        return self._register(name, Counter)
+
+    def gauge(self, name: str, read: Callable[[], float]) -> Gauge:
+        return self._register(name, lambda: Gauge(read))
+
+    def histogram(self, name: str, buckets: List[float] = None) -> Histogram:
+        return self._register(name, lambda: Histogram(buckets or LATENCY_BUCKETS))
+
+    def snapshot(self, prefix: str = "") -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+
+        return {
+            name: metric.snapshot()
+            for name, metric in sorted(metrics.items())
+            if name.startswith(prefix)
+        }
+
+
+metrics = MetricsRegistry()
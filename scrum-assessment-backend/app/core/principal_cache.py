@@ -0,0 +1,51 @@
+import threading
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.user import UserSchema
+
+hits = metrics.counter("principal_cache_hits_total")
+misses = metrics.counter("principal_cache_misses_total")
+
+
+class PrincipalCache:
+    """
+    TTL/LRU cache of authenticated users keyed by the username in the token.
+    Entries are dropped when the user is changed or deleted; the TTL bounds
+    staleness for changes made by other processes.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._lock = threading.Lock()
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generation = 0
+
+    def get(self, username: str) -> UserSchema | None:
+        with self._lock:
+            user = self._cache.get(username)
+
+        (hits if user is not None else misses).inc()
+        return user
+
+    def set(self, username: str, user: UserSchema, generation: int):
+        """
+        Store a user loaded while `generation` was current, unless a user was
+        invalidated in the meantime.
+        """
+        with self._lock:
+            if generation == self.generation:
+                self._cache[username] = user
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            self.generation += 1
+            for username, user in list(self._cache.items()):
+                if user.id == user_id:
+                    del self._cache[username]
+
+
+principal_cache = PrincipalCache(
+    settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL
+)
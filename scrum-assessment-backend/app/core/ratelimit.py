@@ -0,0 +1,62 @@
+import fcntl
+import json
+import random
+import time
+
+
+class FileTokenBucket:
+    """
+    Token bucket whose state lives in a small file guarded by flock, so every
+    uvicorn worker on the host draws from the same budget.
+    """
+
+    def __init__(self, path: str, capacity: float, refill_per_second: float):
+        self.path = path
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+
+    def acquire(self, tokens: float = 1):
+        """
+        Block until `tokens` are available and take them.
+        """
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+
+            time.sleep(wait)
+
+    def _try_acquire(self, tokens: float) -> float:
+        with open(self.path, "a+") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                raw = file.read()
+                now = time.time()
+                state = json.loads(raw) if raw else {}
+
+                available = state.get("tokens", self.capacity)
+                elapsed = max(0.0, now - state.get("updated_at", now))
+                available = min(
+                    self.capacity, available + elapsed * self.refill_per_second
+                )
+
+                if available >= tokens:
+                    available -= tokens
+                    wait = 0.0
+                else:
+                    wait = (tokens - available) / self.refill_per_second
+
+                file.seek(0)
+                file.truncate()
+                json.dump({"tokens": available, "updated_at": now}, file)
+                return wait
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Exponential backoff with full jitter.
+    """
+    return random.uniform(0, min(maximum, base * 2**attempt))
@@ -1,20 +1,145 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
 from datetime import datetime, timedelta
+from typing import Callable, List
+
 from passlib.context import CryptContext
 from jose import jwt
 from app.core.config import settings
+from app.core.exceptions import ServiceBusyException
+from app.core.metrics import metrics
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+hash_queue_wait = metrics.histogram("password_hash_queue_seconds")
+hash_duration = metrics.histogram("password_hash_seconds")
+hash_rejected = metrics.counter("password_hash_rejected_total")
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated process pool, so slow hashes neither hold the
+    GIL nor pile up in the request threadpool. At most `max_pending` calls are
+    handed to the pool; callers that can't get a slot within `queue_timeout`,
+    or whose hash is not done within `timeout`, get ServiceBusyException.
+    With 0 workers hashing runs inline.
+    """
+
+    def __init__(
+        self, workers: int, max_pending: int, queue_timeout: float, timeout: float
+    ):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = 0
+
+        metrics.gauge("password_hash_pending", lambda: self._pending)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a threaded server is unsafe, start clean workers
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+
+        return self._executor
+
+    def _acquire(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            hash_rejected.inc()
+            raise ServiceBusyException("Too many authentication requests")
+
+        hash_queue_wait.observe(time.perf_counter() - start)
+        with self._lock:
+            self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            hash_rejected.inc()
+            raise ServiceBusyException("Authentication is taking too long")
+
+    def run(self, func: Callable, *args):
+        self._acquire()
+        start = time.perf_counter()
+        try:
+            if not self.workers:
+                return func(*args)
+
+            return self._result(self._get_executor().submit(func, *args))
+        finally:
+            hash_duration.observe(time.perf_counter() - start)
+            self._release()
+
+    def map(self, func: Callable, items: List) -> List:
+        """
+        Run `func` over many items in chunks of one item per worker, each
+        chunk taking a pending slot of its own. Single calls queue behind at
+        most one chunk instead of the whole batch.
+        """
+        results = []
+        size = max(1, self.workers)
+        for start in range(0, len(items), size):
+            chunk = items[start : start + size]
+            self._acquire()
+            try:
+                if not self.workers:
+                    results.extend(func(item) for item in chunk)
+                    continue
+
+                executor = self._get_executor()
+                futures = [executor.submit(func, item) for item in chunk]
+                results.extend(self._result(future) for future in futures)
+            finally:
+                self._release()
+
+        return results
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_PENDING,
+    settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+    settings.PASSWORD_HASH_TIMEOUT,
+)
+
 
 # Hash password
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.run(_hash, password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    return password_hasher.map(_hash, passwords)
 
 
 # Verify password
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(_verify, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import List, Type
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def encode_default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(content, exclude_unset: bool = False) -> bytes:
+    """
+    Serialize a response body straight to bytes, skipping jsonable_encoder.
+    Models and lists of one model go through pydantic-core, everything else
+    through orjson.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(
+            content, exclude_unset=exclude_unset
+        )
+
+    if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+        model = type(content[0])
+        if all(type(item) is model for item in content):
+            return list_adapter(model).dump_json(content, exclude_unset=exclude_unset)
+
+    return orjson.dumps(content, default=encode_default)
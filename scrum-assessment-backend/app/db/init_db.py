@@ -1,4 +1,7 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
 
 from app.db.base import Base
 from app.db.session import engine
@@ -8,8 +11,40 @@ from app.core.config import settings
 from app.core.security import hash_password
 
 
+def upgrade_schema(connection: Connection):
+    """
+    create_all only creates missing tables. Add the columns and indexes that
+    the models gained since an existing table was created; new columns must
+    be nullable or have a server default. Safe to run on every start.
+    """
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"Cannot add {table.name}.{column.name}: NOT NULL without a "
+                    "server default"
+                )
+            name = connection.dialect.identifier_preparer.format_table(table)
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {name} ADD COLUMN {ddl}"))
+
+        indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(connection)
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        upgrade_schema(connection)
 
     # Create a session to insert seed data
     with Session(bind=engine) as db:
@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import DateTime, literal, tuple_
+from sqlalchemy.orm import Query
+
+from app.core.exceptions import InvalidParameterException
+
+
+def search_pattern(term: str) -> str:
+    # Substring match: on PostgreSQL the searched columns have trigram indexes
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, default=lambda v: v.isoformat())
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: tuple) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(keys):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v) if isinstance(k.type, DateTime) else v
+            for k, v in zip(keys, values)
+        ]
+    except (TypeError, ValueError):
+        raise InvalidParameterException("Invalid cursor")
+
+
+def paginate(
+    query: Query,
+    sort: str,
+    columns: dict,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List, Optional[str]]:
+    """
+    Keyset pagination on (sort column, id). `sort` is a key of `columns`,
+    prefixed with "-" for descending order. Returns the page and the cursor
+    of the next one, if any.
+    """
+    descending = sort.startswith("-")
+    column = columns[sort.lstrip("-")]
+    keys = (id_column,) if column is id_column else (column, id_column)
+
+    if cursor:
+        values = [
+            literal(value, k.type)
+            for k, value in zip(keys, decode_cursor(cursor, keys))
+        ]
+        if descending:
+            query = query.filter(tuple_(*keys) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*keys) > tuple_(*values))
+
+    order = [k.desc() if descending else k.asc() for k in keys]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], k.key) for k in keys])
+
+    return rows, next_cursor
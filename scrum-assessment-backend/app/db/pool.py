@@ -0,0 +1,82 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+checkout_latency = metrics.histogram("db_pool_checkout_seconds")
+held_duration = metrics.histogram("db_pool_held_seconds")
+long_held = metrics.counter("db_pool_long_held_total")
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool timing how long callers wait to get a connection.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            checkout_latency.observe(time.perf_counter() - start)
+
+
+_checked_out = {}
+_checked_out_lock = threading.Lock()
+
+
+def get_long_held_connections() -> list:
+    """
+    Connections currently checked out for longer than DB_LONG_HELD_SECONDS.
+    """
+    now = time.monotonic()
+    with _checked_out_lock:
+        held = list(_checked_out.values())
+
+    return [
+        {"thread": thread, "held_seconds": round(now - since, 3)}
+        for thread, since in held
+        if now - since > settings.DB_LONG_HELD_SECONDS
+    ]
+
+
+def instrument_pool(engine):
+    pool = engine.pool
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        since = time.monotonic()
+        connection_record.info["checked_out_at"] = since
+        with _checked_out_lock:
+            _checked_out[id(connection_record)] = (
+                threading.current_thread().name,
+                since,
+            )
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        with _checked_out_lock:
+            _checked_out.pop(id(connection_record), None)
+
+        since = connection_record.info.pop("checked_out_at", None)
+        if since is None:
+            return
+
+        held = time.monotonic() - since
+        held_duration.observe(held)
+        if held > settings.DB_LONG_HELD_SECONDS:
+            long_held.inc()
+            logger.warning("Database connection was held for %.1fs", held)
+
+    metrics.gauge("db_pool_size", pool.size)
+    metrics.gauge("db_pool_checked_out", pool.checkedout)
+    metrics.gauge("db_pool_checked_in", pool.checkedin)
+    metrics.gauge("db_pool_overflow", lambda: max(0, pool.overflow()))
+    metrics.gauge("db_pool_long_held_now", lambda: len(get_long_held_connections()))
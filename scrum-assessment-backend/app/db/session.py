@@ -1,21 +1,56 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
+from typing import Optional
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, instrument_pool
 
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+instrument_pool(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+_current_session: ContextVar[Optional[Session]] = ContextVar("db_session", default=None)
+
+
+@contextmanager
+def session_scope():
+    """
+    Unit of work: bind one session to the outermost service call or job.
+    Functions decorated with with_db_session inside the scope reuse it instead
+    of opening their own, and only the outermost scope closes it, returning
+    its connection to the pool.
+    """
+    db = _current_session.get()
+    if db is not None:
+        yield db
+        return
+
+    db = SessionLocal()
+    token = _current_session.set(db)
+    try:
+        yield db
+    finally:
+        _current_session.reset(token)
+        db.close()
+
 
 def with_db_session(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        db = SessionLocal()
-        try:
+        with session_scope() as db:
             return func(*args, db=db, **kwargs)
-        finally:
-            db.close()
 
     return wrapper
@@ -1,13 +1,35 @@
+from contextlib import asynccontextmanager
 from http import HTTPStatus
+
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import auth, admin, user
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.exceptions import InvalidCredentialsException, DataNotFoundException
+from app.core.jobs import acquire_worker_lock
+from app.core.exceptions import (
+    InvalidCredentialsException,
+    DataNotFoundException,
+    ServiceBusyException,
+    InvalidParameterException,
+    ScoreCalculationException,
+)
+
 
-app = FastAPI(title=settings.PROJECT_NAME)
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    lock = acquire_worker_lock(settings.JOB_WORKER_LOCK_FILE)
+    yield
+    lock.close()
+
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
@@ -24,7 +46,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # GET, POST, PUT, DELETE, OPTIONS
     allow_headers=["*"],  # Authorization, Content-Type, etc.
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination of admin lists
 )
+app.add_middleware(CompressionMiddleware)
 
 
 @app.exception_handler(DataNotFoundException)
@@ -43,6 +67,32 @@ async def invalid_credentials_handler(_: Request, exc: InvalidCredentialsExcepti
     )
 
 
+@app.exception_handler(InvalidParameterException)
+async def invalid_parameter_handler(_: Request, exc: InvalidParameterException):
+    return JSONResponse(
+        status_code=HTTPStatus.BAD_REQUEST,
+        content={"error": exc.detail},
+    )
+
+
+@app.exception_handler(ServiceBusyException)
+async def service_busy_handler(_: Request, exc: ServiceBusyException):
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content={"error": exc.detail},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(ScoreCalculationException)
+async def score_calculation_handler(_: Request, exc: ScoreCalculationException):
+    # The response sheet could not be read or scored upstream
+    return JSONResponse(
+        status_code=HTTPStatus.BAD_GATEWAY,
+        content={"error": exc.detail},
+    )
+
+
 @app.get("/")
 def root():
     return {"message": "Hello World"}
@@ -4,3 +4,10 @@ from app.models.user import User
 from app.models.role import Role
 from app.models.sheet import Sheet
 from app.models.project import Project
+from app.models.score import (
+    ScoreRun,
+    SectionScore,
+    GroupScore,
+    LevelScore,
+    ScoreSnapshot,
+)
@@ -1,3 +1,24 @@
+from sqlalchemy import DDL, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+# Trigram indexes need the pg_trgm extension
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def trigram_index(name: str, column: str) -> Index:
+    """
+    GIN trigram index, which serves the `ilike('%term%')` list searches that
+    a btree index cannot. PostgreSQL only.
+    """
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
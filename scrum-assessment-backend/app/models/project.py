@@ -1,22 +1,49 @@
 from datetime import datetime, UTC
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 
-from app.models.base_class import Base
+from app.models.base_class import Base, trigram_index
 
 
 class Project(Base):
     __tablename__ = "projects"
+    # Keyset pagination orders by (sort column, id); search matches substrings
+    __table_args__ = (
+        Index("ix_projects_name_id", "name", "id"),
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        trigram_index("ix_projects_name_trgm", "name"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.now(UTC))
-    updated_at = Column(DateTime, onupdate=datetime.now(UTC))
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    updated_at = Column(DateTime, onupdate=lambda: datetime.now(UTC))
     smm_data = Column(JSON, nullable=True)
+    # Achieved level of the last calculation, kept apart from smm_data for lists
+    smm_level = Column(String, nullable=True)
+    smm_computed_at = Column(DateTime, nullable=True)
+    # Seconds before scores are refreshed, settings.SCORE_MAX_AGE when unset
+    score_max_age = Column(Integer, nullable=True)
+    # Last processed response row and per-section answer counts
+    smm_state = Column(JSON, nullable=True)
+    # Last failed recalculation, cleared by the next successful one
+    smm_failed_at = Column(DateTime, nullable=True)
 
     sheet_id = Column(Integer, ForeignKey("sheets.id"), unique=True, nullable=False)
     sheet = relationship("Sheet", back_populates="project", uselist=False)
 
-    moderator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    moderator_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     moderator = relationship("User", back_populates="projects", uselist=False)
+
+    score_run = relationship(
+        "ScoreRun",
+        back_populates="project",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+    score_snapshots = relationship(
+        "ScoreSnapshot",
+        back_populates="project",
+        cascade="all, delete-orphan",
+    )
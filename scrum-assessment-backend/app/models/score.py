@@ -0,0 +1,123 @@
+from datetime import datetime, UTC
+
+from sqlalchemy import (
+    Column,
+    Index,
+    Integer,
+    String,
+    Float,
+    DateTime,
+    ForeignKey,
+    LargeBinary,
+)
+from sqlalchemy.orm import relationship
+
+from app.models.base_class import Base
+
+
+class ScoreRun(Base):
+    """
+    Relational copy of the latest smm_data of a project for analytics across
+    projects. Each recalculation replaces the project's run.
+    """
+
+    __tablename__ = "score_runs"
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    computed_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    num_of_rows = Column(Integer, nullable=False)
+
+    project = relationship("Project", back_populates="score_run")
+    sections = relationship(
+        "SectionScore", back_populates="run", cascade="all, delete-orphan"
+    )
+    groups = relationship(
+        "GroupScore", back_populates="run", cascade="all, delete-orphan"
+    )
+    levels = relationship(
+        "LevelScore", back_populates="run", cascade="all, delete-orphan"
+    )
+
+    __table_args__ = (Index("ix_score_runs_project_id", "project_id", unique=True),)
+
+
+class SectionScore(Base):
+    __tablename__ = "section_scores"
+    id = Column(Integer, primary_key=True)
+    run_id = Column(
+        Integer, ForeignKey("score_runs.id", ondelete="CASCADE"), nullable=False
+    )
+    project_id = Column(Integer, nullable=False)
+    section = Column(String, nullable=False)
+    group = Column(String, nullable=False)
+    kpa = Column(Float, nullable=False)
+    interpretation = Column(String, nullable=True)
+
+    run = relationship("ScoreRun", back_populates="sections")
+
+    __table_args__ = (
+        Index("ix_section_scores_run_id", "run_id"),
+        Index("ix_section_scores_section_kpa", "section", "kpa"),
+    )
+
+
+class GroupScore(Base):
+    __tablename__ = "group_scores"
+    id = Column(Integer, primary_key=True)
+    run_id = Column(
+        Integer, ForeignKey("score_runs.id", ondelete="CASCADE"), nullable=False
+    )
+    project_id = Column(Integer, nullable=False)
+    group = Column(String, nullable=False)
+    total_kpa = Column(Float, nullable=False)
+    interpretation = Column(String, nullable=True)
+
+    run = relationship("ScoreRun", back_populates="groups")
+
+    __table_args__ = (
+        Index("ix_group_scores_run_id", "run_id"),
+        Index("ix_group_scores_group_total_kpa", "group", "total_kpa"),
+    )
+
+
+class LevelScore(Base):
+    __tablename__ = "level_scores"
+    id = Column(Integer, primary_key=True)
+    run_id = Column(
+        Integer, ForeignKey("score_runs.id", ondelete="CASCADE"), nullable=False
+    )
+    project_id = Column(Integer, nullable=False)
+    level = Column(String, nullable=False)
+    kpa_rating = Column(Float, nullable=False)
+    interpretation = Column(String, nullable=True)
+
+    run = relationship("ScoreRun", back_populates="levels")
+
+    __table_args__ = (
+        Index("ix_level_scores_run_id", "run_id"),
+        Index("ix_level_scores_level_kpa_rating", "level", "kpa_rating"),
+    )
+
+
+class ScoreSnapshot(Base):
+    """
+    Append-only history of recalculations. `scores` holds the section, group
+    and level scores packed by pack_scores.
+    """
+
+    __tablename__ = "score_snapshots"
+    id = Column(Integer, primary_key=True)
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    computed_at = Column(DateTime, nullable=False)
+    num_of_rows = Column(Integer, nullable=False)
+    scores = Column(LargeBinary, nullable=False)
+
+    project = relationship("Project", back_populates="score_snapshots")
+
+    __table_args__ = (
+        Index("ix_score_snapshots_project_id_computed_at", "project_id", "computed_at"),
+    )
@@ -1,19 +1,29 @@
 from datetime import datetime, UTC
 
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime
+from sqlalchemy import Column, Index, Integer, String, Boolean, Text, DateTime
 from sqlalchemy.orm import relationship
 
-from app.models.base_class import Base
+from app.models.base_class import Base, trigram_index
 
 
 class Sheet(Base):
     __tablename__ = "sheets"
+    # Keyset pagination orders by (sort column, id); search matches substrings
+    __table_args__ = (
+        Index("ix_sheets_sheet_filename_id", "sheet_filename", "id"),
+        Index("ix_sheets_created_at_id", "created_at", "id"),
+        trigram_index("ix_sheets_sheet_filename_trgm", "sheet_filename"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     sheet_filename = Column(String, nullable=False)
+    # "gsheet", "file" (CSV/Parquet under RESPONSE_FILES_DIR) or "memory"
+    source_type = Column(
+        String, nullable=False, default="gsheet", server_default="gsheet"
+    )
     description = Column(Text, nullable=True)
     form_link = Column(String, nullable=False)
-    fill_form_status = Column(Boolean, nullable=True, default=False)
-    created_at = Column(DateTime, default=datetime.now(UTC))
-    updated_at = Column(DateTime, onupdate=datetime.now(UTC))
+    fill_form_status = Column(Boolean, nullable=True, default=False, index=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    updated_at = Column(DateTime, onupdate=lambda: datetime.now(UTC))
 
     project = relationship("Project", back_populates="sheet", uselist=False)
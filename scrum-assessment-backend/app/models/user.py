@@ -1,22 +1,29 @@
 from datetime import datetime, UTC
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 
-from app.models.base_class import Base
+from app.models.base_class import Base, trigram_index
 
 
 class User(Base):
     __tablename__ = "users"
+    # Keyset pagination orders by (sort column, id); search matches substrings
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        trigram_index("ix_users_username_trgm", "username"),
+        trigram_index("ix_users_email_trgm", "email"),
+        trigram_index("ix_users_fullname_trgm", "fullname"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True)
     email = Column(String, unique=True, index=True)
     fullname = Column(String, nullable=True)
     password = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.now(UTC))
-    updated_at = Column(DateTime, onupdate=datetime.now(UTC))
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    updated_at = Column(DateTime, onupdate=lambda: datetime.now(UTC))
 
-    role_id = Column(Integer, ForeignKey("roles.id"))
+    role_id = Column(Integer, ForeignKey("roles.id"), index=True)
     role = relationship("Role", back_populates="users")
 
     projects = relationship("Project", back_populates="moderator")
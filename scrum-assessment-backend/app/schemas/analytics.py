@@ -0,0 +1,40 @@
+from typing import Dict, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class KpaDistributionSchema(BaseModel):
+    group: str
+    section: str
+    projects: int
+    average: float
+    minimum: float
+    maximum: float
+    # Number of projects per SCORE_CONSTANT category
+    categories: Dict[str, int]
+
+
+class LevelRankingSchema(BaseModel):
+    level: str
+    rank: int
+    project_id: int
+    project_name: str
+    kpa_rating: float
+    interpretation: Optional[str] = None
+
+
+class BelowThresholdParams(BaseModel):
+    scope: Literal["section", "group", "level"] = "group"
+    name: Optional[str] = None
+    # Either a score or a SCORE_CONSTANT category whose lower bound is used
+    threshold: Optional[float] = None
+    category: Optional[str] = None
+
+
+class BelowThresholdSchema(BaseModel):
+    project_id: int
+    project_name: str
+    scope: str
+    name: str
+    score: float
+    interpretation: Optional[str] = None
@@ -0,0 +1,9 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ExportParams(BaseModel):
+    format: Literal["csv", "xlsx", "parquet"] = "csv"
+    # "scores": group and level scores, "responses": raw answers per respondent
+    dataset: Literal["scores", "responses"] = "scores"
@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class TrendPointSchema(BaseModel):
+    computed_at: datetime
+    num_of_rows: int
+    smm_level: Optional[str] = None
+    levels: Dict[str, float]
+    groups: Optional[Dict[str, float]] = None
+    sections: Optional[Dict[str, float]] = None
@@ -0,0 +1,46 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+class PageParams(BaseModel):
+    cursor: Optional[str] = None
+    limit: int = Field(
+        default=settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX
+    )
+    search: Optional[str] = None
+
+
+class UserListParams(PageParams):
+    role: Optional[str] = None
+    sort: Literal[
+        "id",
+        "-id",
+        "username",
+        "-username",
+        "email",
+        "-email",
+        "created_at",
+        "-created_at",
+    ] = "id"
+
+
+class ProjectListParams(PageParams):
+    moderator_id: Optional[int] = None
+    # Comma separated extra fields of ProjectSummarySchema
+    fields: Optional[str] = None
+    sort: Literal["id", "-id", "name", "-name", "created_at", "-created_at"] = "id"
+
+
+class SheetListParams(PageParams):
+    fill_form_status: Optional[bool] = None
+    sort: Literal[
+        "id",
+        "-id",
+        "sheet_filename",
+        "-sheet_filename",
+        "created_at",
+        "-created_at",
+    ] = "id"
@@ -1,8 +1,7 @@
-from dataclasses import Field
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.sheet import SheetSchema
 from app.schemas.user import UserSchema
@@ -15,14 +14,41 @@ class ProjectSchema(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
     smm_data: Optional[dict] = None
+    smm_computed_at: Optional[datetime] = None
+    score_max_age: Optional[int] = None
     moderator: Optional[UserSchema] = None
     sheet: Optional[SheetSchema] = None
 
     model_config = ConfigDict(populate_by_name=True, from_attributes=True)
 
 
+class ProjectSummarySchema(BaseModel):
+    id: int
+    name: str
+    moderator_name: Optional[str] = None
+    smm_level: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    # Only present when asked for through the `fields` list parameter
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+    smm_data: Optional[dict] = None
+    moderator: Optional[UserSchema] = None
+    sheet: Optional[SheetSchema] = None
+
+
 class CreateUpdateProjectRequest(BaseModel):
     name: str
     description: Optional[str] = None
     sheet_id: int
     moderator_id: int
+    score_max_age: Optional[int] = Field(default=None, ge=1)
+
+
+class ScoreFreshnessSchema(BaseModel):
+    computed_at: Optional[datetime] = None
+    max_age: int
+    state: Literal["fresh", "stale"]
+    # Background recalculation started because the scores were stale
+    refresh_job_id: Optional[str] = None
+    # Last failed recalculation, no refresh is started until the backoff ends
+    refresh_failed_at: Optional[datetime] = None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict
 
@@ -7,6 +7,7 @@ from pydantic import BaseModel, ConfigDict
 class SheetSchema(BaseModel):
     id: int
     sheet_filename: str
+    source_type: str = "gsheet"
     description: Optional[str]
     form_link: str
     fill_form_status: bool
@@ -21,6 +22,8 @@ class SheetSchema(BaseModel):
 
 class CreateUpdateSheetRequest(BaseModel):
     sheet_filename: str
+    # "memory" sources are per-process fixtures, not creatable through the API
+    source_type: Literal["gsheet", "file"] = "gsheet"
     description: Optional[str]
     form_link: Optional[str]
     fill_form_status: Optional[bool]
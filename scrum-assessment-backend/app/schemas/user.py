@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict
 
@@ -51,3 +51,17 @@ class UserSchema(BaseModel):
 class LoginResponse(BaseModel):
     access_token: str
     token_type: str
+
+
+class ImportUserResult(BaseModel):
+    row: int
+    username: Optional[str] = None
+    status: str
+    detail: Optional[str] = None
+    user_id: Optional[int] = None
+
+
+class ImportUsersResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ImportUserResult]
@@ -0,0 +1,218 @@
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import SCORE_CONSTANT, SECTION_GROUPS, LEVEL_CONSTANT
+from app.core.exceptions import InvalidParameterException
+from app.core.utilities import get_score_category
+from app.db.session import with_db_session
+from app.models.project import Project
+from app.models.score import ScoreRun, SectionScore, GroupScore, LevelScore
+from app.schemas.analytics import (
+    BelowThresholdParams,
+    BelowThresholdSchema,
+    KpaDistributionSchema,
+    LevelRankingSchema,
+)
+from app.services.scoring import PLAN
+
+# (model, name column, score column) per BelowThresholdParams.scope
+SCORE_SCOPES = {
+    "section": (SectionScore, SectionScore.section, SectionScore.kpa),
+    "group": (GroupScore, GroupScore.group, GroupScore.total_kpa),
+    "level": (LevelScore, LevelScore.level, LevelScore.kpa_rating),
+}
+SCOPE_NAMES = {
+    "section": set(PLAN.sections),
+    "group": set(SECTION_GROUPS),
+    "level": set(LEVEL_CONSTANT),
+}
+
+
+def build_score_run(project_id: int, data: dict, num_of_rows: int) -> ScoreRun:
+    """
+    Relational rows for a score document built by score_counts.
+    """
+    run = ScoreRun(project_id=project_id, num_of_rows=num_of_rows)
+    for group in data["group_scores"]:
+        run.groups.append(
+            GroupScore(
+                project_id=project_id,
+                group=group["goal"],
+                total_kpa=group["totalKPA"],
+                interpretation=group["interpretation"],
+            )
+        )
+        for objective in group["objectives"]:
+            run.sections.append(
+                SectionScore(
+                    project_id=project_id,
+                    section=objective["objective"],
+                    group=group["goal"],
+                    kpa=objective["kpa"],
+                    interpretation=get_score_category(objective["kpa"]),
+                )
+            )
+
+    for level in data["level_scores"]:
+        run.levels.append(
+            LevelScore(
+                project_id=project_id,
+                level=level["level"],
+                kpa_rating=level["kpaRating"],
+                interpretation=level["interpretation"],
+            )
+        )
+
+    return run
+
+
+def replace_score_run(project: Project, data: dict, num_of_rows: int, db: Session):
+    # One bulk DELETE per table rather than the ORM cascade deleting every
+    # score row on its own, and before the insert, which would otherwise
+    # clash on the unique project_id
+    for model in (SectionScore, GroupScore, LevelScore, ScoreRun):
+        db.query(model).filter(model.project_id == project.id).delete(
+            synchronize_session=False
+        )
+    # The old run is gone, so assigning the new one need not load it
+    set_committed_value(project, "score_run", None)
+
+    project.score_run = build_score_run(project.id, data, num_of_rows)
+
+
+@with_db_session
+def get_kpa_distribution(db: Session) -> List[KpaDistributionSchema]:
+    aggregates = (
+        db.query(
+            SectionScore.group,
+            SectionScore.section,
+            func.count(),
+            func.avg(SectionScore.kpa),
+            func.min(SectionScore.kpa),
+            func.max(SectionScore.kpa),
+        )
+        .group_by(SectionScore.group, SectionScore.section)
+        .all()
+    )
+    categories = {}
+    for section, interpretation, count in (
+        db.query(SectionScore.section, SectionScore.interpretation, func.count())
+        .group_by(SectionScore.section, SectionScore.interpretation)
+        .all()
+    ):
+        categories.setdefault(section, {})[interpretation] = count
+
+    order = {section: i for i, section in enumerate(PLAN.sections)}
+    aggregates.sort(key=lambda row: order.get(row[1], len(order)))
+    return [
+        KpaDistributionSchema(
+            group=group,
+            section=section,
+            projects=count,
+            average=round(average, 2),
+            minimum=minimum,
+            maximum=maximum,
+            categories={
+                category: categories.get(section, {}).get(category, 0)
+                for category in SCORE_CONSTANT
+            },
+        )
+        for group, section, count, average, minimum, maximum in aggregates
+    ]
+
+
+@with_db_session
+def get_level_ranking(
+    level: Optional[str], limit: Optional[int], db: Session
+) -> List[LevelRankingSchema]:
+    if level is not None and level not in LEVEL_CONSTANT:
+        raise InvalidParameterException(f"Unknown level {level}")
+
+    rank = (
+        func.rank()
+        .over(partition_by=LevelScore.level, order_by=LevelScore.kpa_rating.desc())
+        .label("rank")
+    )
+    ranked = db.query(
+        LevelScore.level,
+        rank,
+        LevelScore.project_id,
+        LevelScore.kpa_rating,
+        LevelScore.interpretation,
+    )
+    if level is not None:
+        ranked = ranked.filter(LevelScore.level == level)
+    ranked = ranked.subquery()
+
+    query = db.query(ranked, Project.name).join(
+        Project, Project.id == ranked.c.project_id
+    )
+    if limit is not None:
+        query = query.filter(ranked.c.rank <= limit)
+
+    order = {name: i for i, name in enumerate(LEVEL_CONSTANT)}
+    rows = sorted(
+        query.order_by(ranked.c.rank, ranked.c.project_id).all(),
+        key=lambda row: order[row.level],
+    )
+    return [
+        LevelRankingSchema(
+            level=row.level,
+            rank=row.rank,
+            project_id=row.project_id,
+            project_name=row.name,
+            kpa_rating=row.kpa_rating,
+            interpretation=row.interpretation,
+        )
+        for row in rows
+    ]
+
+
+def resolve_threshold(params: BelowThresholdParams) -> float:
+    if params.threshold is not None:
+        return params.threshold
+    category = params.category or "Largely Achieved"
+    if category not in SCORE_CONSTANT:
+        raise InvalidParameterException(f"Unknown category {category}")
+
+    return SCORE_CONSTANT[category][0]
+
+
+@with_db_session
+def get_projects_below(
+    params: BelowThresholdParams, db: Session
+) -> List[BelowThresholdSchema]:
+    model, name_column, score_column = SCORE_SCOPES[params.scope]
+    if params.name is not None and params.name not in SCOPE_NAMES[params.scope]:
+        raise InvalidParameterException(f"Unknown {params.scope} {params.name}")
+
+    query = (
+        db.query(
+            model.project_id,
+            Project.name,
+            name_column,
+            score_column,
+            model.interpretation,
+        )
+        .join(Project, Project.id == model.project_id)
+        .filter(score_column < resolve_threshold(params))
+    )
+    if params.name is not None:
+        query = query.filter(name_column == params.name)
+
+    return [
+        BelowThresholdSchema(
+            project_id=project_id,
+            project_name=project_name,
+            scope=params.scope,
+            name=name,
+            score=score,
+            interpretation=interpretation,
+        )
+        for project_id, project_name, name, score, interpretation in query.order_by(
+            score_column, model.project_id
+        )
+    ]
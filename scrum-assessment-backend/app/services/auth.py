@@ -1,7 +1,9 @@
 import json
+from typing import List
 
 import sqlalchemy
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import ValidationError
 
 from app.core.exceptions import InvalidCredentialsException
 from app.schemas.user import (
@@ -9,13 +11,27 @@ from app.schemas.user import (
     LoginResponse,
     UserSchema,
     CreateUserRequest,
+    ImportUserResult,
+    ImportUsersResponse,
+)
+from app.services.role import get_role, get_roles
+from app.services.user import (
+    get_user_by_username_or_email,
+    create_user,
+    create_users,
+    get_existing_usernames_and_emails,
+)
+from app.core.security import (
+    hash_password,
+    hash_passwords,
+    verify_password,
+    create_access_token,
 )
-from app.services.role import get_role
-from app.services.user import get_user_by_username_or_email, create_user
-from app.core.security import hash_password, verify_password, create_access_token
 
 
 def login_user(form_data: OAuth2PasswordRequestForm) -> LoginResponse:
+    # The lookup's session is closed when it returns, so no connection is
+    # held while waiting for a hash slot and for bcrypt
     user = get_user_by_username_or_email(form_data.username)
 
     if not user or not verify_password(form_data.password, user.password):
@@ -52,3 +68,84 @@ def register_user(
         raise InvalidCredentialsException("Username or email already exists")
 
     return UserSchema.model_validate(user)
+
+
+def import_users(rows: List[dict]) -> ImportUsersResponse:
+    """
+    Create many users at once. Rows are validated and checked for conflicts
+    first, passwords are hashed in parallel with no session open and every
+    valid row is inserted in one transaction. Each row gets a CREATED,
+    INVALID or CONFLICT result.
+    """
+    roles = {role.role_name: role for role in get_roles()}
+    results = [None] * len(rows)
+    accepted = []
+    usernames, emails = set(), set()
+
+    for index, row in enumerate(rows):
+        result = ImportUserResult(row=index + 1, status="INVALID")
+        results[index] = result
+        try:
+            payload = CreateUserRequest.model_validate(row)
+        except ValidationError as e:
+            error = e.errors()[0]
+            result.username = row.get("username") if isinstance(row, dict) else None
+            result.detail = f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+            continue
+
+        result.username = payload.username
+        role = roles.get((payload.role or "").upper())
+        if role is None:
+            result.detail = f"Unknown role {payload.role}"
+            continue
+
+        if payload.username in usernames or payload.email in emails:
+            result.status = "CONFLICT"
+            result.detail = "Duplicate username or email in import"
+            continue
+
+        usernames.add(payload.username)
+        emails.add(payload.email)
+        accepted.append((result, payload, role))
+
+    existing_usernames, existing_emails = get_existing_usernames_and_emails(
+        list(usernames), list(emails)
+    )
+    to_create = []
+    for result, payload, role in accepted:
+        if payload.username in existing_usernames or payload.email in existing_emails:
+            result.status = "CONFLICT"
+            result.detail = "Username or email already exists"
+        else:
+            to_create.append((result, payload, role))
+
+    passwords = hash_passwords([payload.password for _, payload, _ in to_create])
+
+    ids = create_users(
+        [
+            {
+                "username": payload.username,
+                "email": payload.email,
+                "fullname": payload.fullname,
+                "password": password,
+                "role_id": role.id,
+            }
+            for (_, payload, role), password in zip(to_create, passwords)
+        ]
+    )
+
+    created = 0
+    for (result, _, _), user_id in zip(to_create, ids):
+        if user_id is None:
+            # Taken by a concurrent insert after the conflict check
+            result.status = "CONFLICT"
+            result.detail = "Username or email already exists"
+            continue
+
+        result.status = "CREATED"
+        result.user_id = user_id
+        created += 1
+
+    return ImportUsersResponse(
+        created=created, failed=len(rows) - created, results=results
+    )
@@ -0,0 +1,369 @@
+import csv
+import io
+import json
+import logging
+import zipfile
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy.orm import Session
+
+from app.core.config import settings, GSHEET_RESPONSE_RANGE
+from app.core.metrics import metrics
+from app.core.utilities import column_to_num, num_to_column
+from app.db.session import with_db_session
+from app.models.project import Project
+from app.models.sheet import Sheet
+from app.schemas.export import ExportParams
+from app.services.response_source import get_response_source
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+SCORE_COLUMNS = [
+    ("project_id", pa.int64()),
+    ("project_name", pa.string()),
+    ("computed_at", pa.timestamp("us")),
+    ("scope", pa.string()),
+    ("name", pa.string()),
+    ("score", pa.float64()),
+    ("interpretation", pa.string()),
+]
+
+RESPONSE_COLUMNS = [("project_id", pa.int64()), ("project_name", pa.string())] + [
+    (num_to_column(column), pa.string())
+    for column in range(
+        column_to_num(GSHEET_RESPONSE_RANGE[0]),
+        column_to_num(GSHEET_RESPONSE_RANGE[1]) + 1,
+    )
+]
+
+# (project_id, project_name, error) of the projects missing from an export
+SKIPPED_COLUMNS = ["project_id", "project_name", "error"]
+Skipped = List[Tuple[int, str, str]]
+
+
+class ChunkBuffer:
+    """
+    Write-only, unseekable file the streaming writers write into and the
+    response drains after every batch.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def batched(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+@with_db_session
+def get_score_page(after_id: int, db: Session) -> list:
+    return (
+        db.query(Project.id, Project.name, Project.smm_computed_at, Project.smm_data)
+        .filter(Project.smm_data.isnot(None), Project.id > after_id)
+        .order_by(Project.id)
+        .limit(settings.EXPORT_PROJECTS_PER_FETCH)
+        .all()
+    )
+
+
+@with_db_session
+def get_response_page(after_id: int, db: Session) -> list:
+    return (
+        db.query(Project.id, Project.name, Sheet.source_type, Sheet.sheet_filename)
+        .join(Project.sheet)
+        .filter(Project.id > after_id)
+        .order_by(Project.id)
+        .limit(settings.EXPORT_PROJECTS_PER_FETCH)
+        .all()
+    )
+
+
+def iter_projects(get_page: Callable[[int], list]) -> Iterator:
+    """
+    Walk the projects in id order, one keyset page per session, so no
+    connection is held while rows are written or sent.
+    """
+    after_id = 0
+    while page := get_page(after_id):
+        yield from page
+        after_id = page[-1].id
+
+
+def iter_score_rows(skipped: Skipped) -> Iterator[tuple]:
+    for project_id, name, computed_at, data in iter_projects(get_score_page):
+        for group in data["group_scores"]:
+            yield (
+                project_id,
+                name,
+                computed_at,
+                "group",
+                group["goal"],
+                group["totalKPA"],
+                group["interpretation"],
+            )
+        for level in data["level_scores"]:
+            yield (
+                project_id,
+                name,
+                computed_at,
+                "level",
+                level["level"],
+                level["kpaRating"],
+                level["interpretation"],
+            )
+
+
+def iter_response_rows(skipped: Skipped) -> Iterator[tuple]:
+    """
+    Every respondent of every project, one project's sheet in memory at a
+    time. Projects whose sheet cannot be read are added to `skipped`, which
+    the writers report at the end, rather than cutting the stream short.
+    """
+    width = len(RESPONSE_COLUMNS) - 2
+    for project in iter_projects(get_response_page):
+        try:
+            rows = get_response_source(project).get_rows()
+        except Exception as e:
+            logger.exception("Export skipped the responses of project %s", project.id)
+            metrics.counter("export_projects_skipped_total").inc()
+            skipped.append((project.id, project.name, str(e) or type(e).__name__))
+            continue
+
+        for row in rows[1:]:
+            yield (project.id, project.name, *row, *[""] * (width - len(row)))
+
+
+def write_csv(
+    columns: list, rows: Iterable[tuple], skipped: Skipped
+) -> Iterator[bytes]:
+    """
+    Skipped projects are reported after the data, one trailer row each
+    starting with "#skipped".
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    yield buffer.getvalue().encode()
+
+    for batch in batched(rows, settings.EXPORT_BATCH_SIZE):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+    if skipped:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(("#skipped", *project) for project in skipped)
+        yield buffer.getvalue().encode()
+
+
+def xlsx_parts(sheets: List[str]) -> dict:
+    """
+    Package parts of a workbook with the given worksheets, which are stored
+    as xl/worksheets/sheet<n>.xml.
+    """
+    numbered = list(enumerate(sheets, 1))
+    return {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+            'content-types"><Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.'
+                'spreadsheetml.worksheet+xml"/>'
+                for n, _ in numbered
+            )
+            + "</Types>"
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+            'relationships"><Relationship Id="rId1" Type="http://schemas.'
+            'openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ),
+        "xl/workbook.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/'
+            'main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships"><sheets>'
+            + "".join(
+                f'<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+                for n, name in numbered
+            )
+            + "</sheets></workbook>"
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+            'relationships">'
+            + "".join(
+                f'<Relationship Id="rId{n}" Type="http://schemas.openxmlformats.'
+                'org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{n}.xml"/>'
+                for n, _ in numbered
+            )
+            + "</Relationships>"
+        ),
+    }
+
+
+XLSX_SHEET_START = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/'
+    b'spreadsheetml/2006/main"><sheetData>'
+)
+XLSX_SHEET_END = b"</sheetData></worksheet>"
+
+
+def xlsx_cell(value) -> str:
+    if value is None or value == "":
+        return "<c/>"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    # Control characters other than tab and newlines are invalid in XML
+    text = "".join(ch for ch in str(value) if ch >= " " or ch in "\t\n\r")
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def xlsx_row(values) -> str:
+    return "<row>" + "".join(map(xlsx_cell, values)) + "</row>"
+
+
+def write_xlsx(
+    columns: list, rows: Iterable[tuple], skipped: Skipped
+) -> Iterator[bytes]:
+    """
+    Minimal workbook of inline strings, zipped on the fly. The output is not
+    seekable, so zipfile writes data descriptors. Skipped projects get a
+    second worksheet; the parts listing the worksheets are written last,
+    once it is known whether there is one.
+    """
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(XLSX_SHEET_START)
+            sheet.write(xlsx_row(name for name, _ in columns).encode())
+            yield buffer.drain()
+
+            for batch in batched(rows, settings.EXPORT_BATCH_SIZE):
+                sheet.write("".join(map(xlsx_row, batch)).encode())
+                yield buffer.drain()
+
+            sheet.write(XLSX_SHEET_END)
+
+        sheets = ["Export"]
+        if skipped:
+            sheets.append("Skipped")
+            archive.writestr(
+                "xl/worksheets/sheet2.xml",
+                XLSX_SHEET_START
+                + "".join(map(xlsx_row, [SKIPPED_COLUMNS, *skipped])).encode()
+                + XLSX_SHEET_END,
+            )
+
+        for name, content in xlsx_parts(sheets).items():
+            archive.writestr(name, content)
+
+    yield buffer.drain()
+
+
+def write_parquet(
+    columns: list, rows: Iterable[tuple], skipped: Skipped
+) -> Iterator[bytes]:
+    """
+    One row group per batch, the footer is written when the rows run out.
+    Skipped projects are listed as JSON in its "skipped_projects" metadata.
+    """
+    schema = pa.schema(columns)
+    buffer = ChunkBuffer()
+    with pq.ParquetWriter(pa.PythonFile(buffer, mode="w"), schema) as writer:
+        for batch in batched(rows, settings.EXPORT_BATCH_SIZE):
+            writer.write_table(
+                pa.Table.from_arrays(
+                    [
+                        pa.array(values, type=t)
+                        for values, (_, t) in zip(zip(*batch), columns)
+                    ],
+                    schema=schema,
+                )
+            )
+            yield buffer.drain()
+
+        if skipped:
+            writer.add_key_value_metadata(
+                {
+                    "skipped_projects": json.dumps(
+                        [dict(zip(SKIPPED_COLUMNS, project)) for project in skipped]
+                    )
+                }
+            )
+
+    yield buffer.drain()
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "parquet": write_parquet}
+DATASETS = {
+    "scores": (SCORE_COLUMNS, iter_score_rows),
+    "responses": (RESPONSE_COLUMNS, iter_response_rows),
+}
+
+
+def export_filename(params: ExportParams) -> str:
+    return f"{params.dataset}.{params.format}"
+
+
+def export_projects(params: ExportParams) -> Iterator[bytes]:
+    """
+    Export body produced incrementally, batch by batch. Projects that could
+    not be exported are reported at the end of the file, see the writers.
+    """
+    columns, iter_rows = DATASETS[params.dataset]
+    skipped = []
+    yield from WRITERS[params.format](columns, iter_rows(skipped), skipped)
@@ -1,111 +1,55 @@
-from typing import List, Dict
+from typing import List
 
-import pandas as pd
 from gspread import Worksheet
 
-from app.core.config import GSHEET_COLUMNS, SECTION_GROUPS, LEVEL_CONSTANT
+from app.core.config import (
+    GSHEET_RESPONSE_RANGE,
+    GSHEET_MEMBER_COLUMN,
+    GSHEET_TIMESTAMP_COLUMN,
+)
 from app.core.gsheet import get_google_sheet_file
-from app.core.utilities import flatten_list, column_to_num, get_score_category
+from app.core.utilities import column_to_num
 
 
-def get_form_sheet(project_id: int):
-    from app.services.project import get_project_by_id
-
-    project = get_project_by_id(project_id)
-    gsheet_file = get_google_sheet_file(project.sheet.sheet_filename)
+def get_form_sheet(sheet_filename: str) -> Worksheet:
+    gsheet_file = get_google_sheet_file(sheet_filename)
     form_sheet = gsheet_file.worksheet("Form Responses 1")
 
     return form_sheet
 
 
-def get_project_members(form_sheet: Worksheet):
-    records = form_sheet.get("C:C")
-    return flatten_list(records)[1:]
-
-
-def calculate_section(sheet: Worksheet, key: str, range: List[str]) -> Dict[str, float]:
-    rng = f"{range[0]}:{range[1]}" if len(range) == 2 else f"{range[0]}:{range[0]}"
-    records = sheet.get(rng)
-    df = pd.DataFrame(records[1:], columns=records[0])
-    num_of_rows = df.shape[0]
-    values_to_count = ["Ya", "Sebagian", "Tidak", "Tidak Berlaku"]
-
-    selected_columns = df.iloc[:, :]
-    counts_dict = {
-        value: int((selected_columns == value).sum().sum()) for value in values_to_count
-    }
-
-    if len(range) == 2:
-        num_of_questions = num_of_rows * (
-            column_to_num(range[1]) - column_to_num(range[0]) + 1
-        )
-    else:
-        num_of_questions = num_of_rows
-
-    print(f"{key} count_dics", counts_dict)
-    if (num_of_questions - counts_dict["Tidak Berlaku"]) == 0:
-        return {key: 0}
-
-    score = (
-        (counts_dict["Ya"] + (0.5 * counts_dict["Sebagian"]))
-        / ((num_of_questions - counts_dict["Tidak Berlaku"]))
-        * 100
-    )
-    score = round(score, 2)
-
-    return {key: score}
-
-
-def calculate_group(sections: List[str], score_dict: Dict[str, float]) -> float:
-    score = sum([score_dict[section] for section in sections]) / len(sections)
-    return round(score, 2)
-
+def get_form_responses(form_sheet: Worksheet, start_row: int = 1) -> List[List[str]]:
+    """
+    Fetch the response block from start_row onwards in a single read (row 1 is
+    the header). Sections and members are sliced from it locally.
+    """
+    start, end = GSHEET_RESPONSE_RANGE
+    return form_sheet.get(f"{start}{start_row}:{end}")
 
-def calculate_level(groups: List[str], score_dict: Dict[str, dict]) -> float:
-    score = sum([score_dict[group]["group_score"] for group in groups]) / len(groups)
-    return round(score, 2)
 
+def get_form_timestamps(form_sheet: Worksheet, end_row: int) -> List[str]:
+    """
+    Timestamps of the responses in rows 2 to end_row, in one narrow read.
+    """
+    if end_row < 2:
+        return []
 
-def calculate_smm_score(sheet: Worksheet):
-    section_scores = {}
-    for key, value in GSHEET_COLUMNS.items():
-        result = calculate_section(sheet, key, value)
-        section_scores = {**section_scores, **result}
+    column = GSHEET_TIMESTAMP_COLUMN
+    values = [
+        row[0] if row else "" for row in form_sheet.get(f"{column}2:{column}{end_row}")
+    ]
+    return values + [""] * (end_row - 1 - len(values))
 
-    group_scores_dict = {}
-    group_scores_list = []
-    for key, value in SECTION_GROUPS.items():
-        group_scores_dict[key] = {
-            "group_score": calculate_group(value, section_scores),
-            "section_score": {v: section_scores[v] for v in value},
-        }
 
-        total_kpa = calculate_group(value, section_scores)
-        group_scores_list.append(
-            {
-                "goal": key,
-                "objectives": [
-                    {"objective": v, "kpa": section_scores[v]} for v in value
-                ],
-                "totalKPA": total_kpa,
-                "interpretation": get_score_category(total_kpa),
-            }
-        )
+def slice_columns(responses: List[List[str]], start: str, end: str) -> List[List[str]]:
+    base = column_to_num(GSHEET_RESPONSE_RANGE[0])
+    first = column_to_num(start) - base
+    width = column_to_num(end) - column_to_num(start) + 1
+    # The API trims trailing empty cells, so pad every row to the slice width
+    records = [row[first : first + width] for row in responses]
+    return [cells + [""] * (width - len(cells)) for cells in records]
 
-    level_scores = []
-    for key, value in LEVEL_CONSTANT.items():
-        level_score = calculate_level(value, group_scores_dict)
-        interpretation = get_score_category(level_score)
-        level_scores.append(
-            {
-                "level": key,
-                "goals": value,
-                "kpaRating": level_score,
-                "interpretation": interpretation,
-            }
-        )
 
-    return {
-        "group_scores": group_scores_list,
-        "level_scores": level_scores,
-    }
+def get_project_members(responses: List[List[str]]) -> List[str]:
+    records = slice_columns(responses, GSHEET_MEMBER_COLUMN, GSHEET_MEMBER_COLUMN)
+    return [row[0] for row in records[1:] if row and row[0]]
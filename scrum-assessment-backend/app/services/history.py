@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, UTC
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import DataNotFoundException
+from app.core.utilities import get_score_category
+from app.db.session import with_db_session
+from app.models.project import Project
+from app.models.score import ScoreSnapshot
+from app.schemas.history import TrendPointSchema
+from app.services.scoring import achieved_level, pack_scores, unpack_scores
+
+
+def naive_utc(value: datetime) -> datetime:
+    # DateTime columns are stored and read back without a timezone
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def record_snapshot(
+    project: Project, data: dict, num_of_rows: int, computed_at: datetime, db: Session
+):
+    computed_at = naive_utc(computed_at)
+    db.add(
+        ScoreSnapshot(
+            project_id=project.id,
+            computed_at=computed_at,
+            num_of_rows=num_of_rows,
+            scores=pack_scores(data),
+        )
+    )
+    prune_snapshots(project.id, computed_at, db)
+
+
+def snapshot_bucket(computed_at: datetime, now: datetime) -> tuple | None:
+    """
+    Retention bucket of a snapshot; only the latest snapshot of a bucket is
+    kept. None means the snapshot is still inside the keep-all window.
+    """
+    age = now - computed_at
+    if age < timedelta(days=settings.SNAPSHOT_KEEP_ALL_DAYS):
+        return None
+    if age < timedelta(days=settings.SNAPSHOT_KEEP_DAILY_DAYS):
+        return ("day", computed_at.date())
+
+    return ("month", computed_at.year, computed_at.month)
+
+
+def prune_snapshots(project_id: int, now: datetime, db: Session) -> int:
+    """
+    Downsample the project's snapshots older than the keep-all window.
+    """
+    now = naive_utc(now)
+    cutoff = now - timedelta(days=settings.SNAPSHOT_KEEP_ALL_DAYS)
+    # Newest first, so the first snapshot seen in a bucket is the one kept
+    snapshots = (
+        db.query(ScoreSnapshot.id, ScoreSnapshot.computed_at)
+        .filter(
+            ScoreSnapshot.project_id == project_id,
+            ScoreSnapshot.computed_at < cutoff,
+        )
+        .order_by(ScoreSnapshot.computed_at.desc())
+        .all()
+    )
+
+    seen = set()
+    expired = []
+    for snapshot_id, computed_at in snapshots:
+        bucket = snapshot_bucket(computed_at, now)
+        if bucket in seen:
+            expired.append(snapshot_id)
+        seen.add(bucket)
+
+    if expired:
+        db.query(ScoreSnapshot).filter(ScoreSnapshot.id.in_(expired)).delete(
+            synchronize_session=False
+        )
+
+    return len(expired)
+
+
+def to_trend_point(snapshot: ScoreSnapshot, full: bool) -> TrendPointSchema:
+    scores = unpack_scores(snapshot.scores)
+    levels = scores["levels"]
+    point = TrendPointSchema(
+        computed_at=snapshot.computed_at,
+        num_of_rows=snapshot.num_of_rows,
+        smm_level=achieved_level(
+            [
+                {"level": level, "interpretation": get_score_category(rating)}
+                for level, rating in levels.items()
+            ]
+        ),
+        levels=levels,
+    )
+    if full:
+        point.groups = scores["groups"]
+        point.sections = scores["sections"]
+
+    return point
+
+
+@with_db_session
+def get_project_trend(
+    project_id: int,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    full: bool,
+    db: Session,
+) -> List[TrendPointSchema]:
+    if not db.query(Project.id).filter(Project.id == project_id).first():
+        raise DataNotFoundException(entity_name="project")
+
+    # Range scan on (project_id, computed_at)
+    query = db.query(ScoreSnapshot).filter(ScoreSnapshot.project_id == project_id)
+    if since is not None:
+        query = query.filter(ScoreSnapshot.computed_at >= naive_utc(since))
+    if until is not None:
+        query = query.filter(ScoreSnapshot.computed_at <= naive_utc(until))
+
+    return [
+        to_trend_point(snapshot, full)
+        for snapshot in query.order_by(ScoreSnapshot.computed_at)
+    ]
@@ -0,0 +1,10 @@
+from app.core.jobs import job_manager
+from app.schemas.job import JobSchema
+
+
+def get_job(job_id: str) -> JobSchema | None:
+    job = job_manager.get(job_id)
+    if job is None:
+        return None
+
+    return JobSchema.model_validate(job)
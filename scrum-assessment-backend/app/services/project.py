@@ -1,14 +1,51 @@
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, UTC
+from typing import List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+import numpy as np
+from sqlalchemy.orm import Session, joinedload, load_only
 
+from app.core.config import settings
+from app.core.exceptions import (
+    DataNotFoundException,
+    InvalidParameterException,
+    ScoreCalculationException,
+    ServiceBusyException,
+)
+from app.core.jobs import Job, JobStatus, job_manager, update_job_progress
+from app.core.metrics import metrics
 from app.models.project import Project
+from app.models.sheet import Sheet
+from app.models.user import User
+from app.db.pagination import paginate, search_pattern
 from app.db.session import with_db_session
-from app.schemas.project import CreateUpdateProjectRequest, ProjectSchema
-from app.services.gsheet import (
-    get_project_members,
-    get_form_sheet,
-    calculate_smm_score,
+from app.schemas.pagination import ProjectListParams
+from app.schemas.job import JobSchema
+from app.schemas.project import (
+    CreateUpdateProjectRequest,
+    ProjectSchema,
+    ProjectSummarySchema,
+    ScoreFreshnessSchema,
+)
+from app.services.analytics import replace_score_run
+from app.services.gsheet import get_project_members
+from app.services.history import record_snapshot
+from app.services.response_source import ResponseSource, get_response_source
+from app.services.scoring import (
+    encode_responses,
+    count_answers,
+    score_counts,
+    achieved_level,
+    fingerprint_row,
+    make_score_state,
+)
+
+
+# Everything ProjectSchema serializes, loaded in the same query
+PROJECT_SCHEMA_OPTIONS = (
+    joinedload(Project.moderator).joinedload(User.role),
+    joinedload(Project.sheet),
 )
 
 
@@ -19,6 +56,7 @@ def create_project(payload: CreateUpdateProjectRequest, db: Session) -> ProjectS
         description=payload.description,
         moderator_id=payload.moderator_id,
         sheet_id=payload.sheet_id,
+        score_max_age=payload.score_max_age,
     )
 
     db.add(project)
@@ -27,15 +65,106 @@ def create_project(payload: CreateUpdateProjectRequest, db: Session) -> ProjectS
     return ProjectSchema.model_validate(project)
 
 
+PROJECT_SORT_COLUMNS = {
+    "id": Project.id,
+    "name": Project.name,
+    "created_at": Project.created_at,
+}
+
+
+PROJECT_SUMMARY_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.smm_level,
+    Project.created_at,
+    Project.updated_at,
+)
+PROJECT_SUMMARY_FIELDS = {"description", "created_at", "smm_data", "moderator", "sheet"}
+
+
+def parse_project_fields(fields: Optional[str]) -> set:
+    requested = {f.strip() for f in fields.split(",") if f.strip()} if fields else set()
+    unknown = requested - PROJECT_SUMMARY_FIELDS
+    if unknown:
+        raise InvalidParameterException(
+            f"Unknown project fields: {', '.join(sorted(unknown))}"
+        )
+
+    return requested
+
+
+def project_summary_options(fields: set) -> list:
+    columns = list(PROJECT_SUMMARY_COLUMNS)
+    if "description" in fields:
+        columns.append(Project.description)
+    if "smm_data" in fields:
+        columns.append(Project.smm_data)
+
+    options = [load_only(*columns)]
+    if "moderator" in fields:
+        options.append(joinedload(Project.moderator).joinedload(User.role))
+    else:
+        options.append(
+            joinedload(Project.moderator).load_only(User.username, User.fullname)
+        )
+    if "sheet" in fields:
+        options.append(joinedload(Project.sheet))
+
+    return options
+
+
+def to_project_summary(project: Project, fields: set) -> ProjectSummarySchema:
+    moderator = project.moderator
+    data = {
+        "id": project.id,
+        "name": project.name,
+        "moderator_name": moderator and (moderator.fullname or moderator.username),
+        "smm_level": project.smm_level,
+        "updated_at": project.updated_at,
+    }
+    # Unrequested fields stay unset so the response leaves them out
+    data.update((field, getattr(project, field)) for field in fields)
+    return ProjectSummarySchema.model_validate(data, from_attributes=True)
+
+
 @with_db_session
-def get_projects(db: Session) -> List[ProjectSchema]:
-    projects = db.query(Project).all()
-    return [ProjectSchema.model_validate(p) for p in projects]
+def get_projects(
+    params: ProjectListParams, db: Session
+) -> Tuple[List[ProjectSummarySchema], Optional[str]]:
+    fields = parse_project_fields(params.fields)
+    query = db.query(Project).options(*project_summary_options(fields))
+    if params.moderator_id is not None:
+        query = query.filter(Project.moderator_id == params.moderator_id)
+
+    if params.search:
+        query = query.filter(
+            Project.name.ilike(search_pattern(params.search), escape="\\")
+        )
+
+    projects, next_cursor = paginate(
+        query,
+        params.sort,
+        PROJECT_SORT_COLUMNS,
+        Project.id,
+        params.cursor,
+        params.limit,
+    )
+    return [to_project_summary(p, fields) for p in projects], next_cursor
+
+
+@with_db_session
+def get_project_ids(db: Session) -> List[int]:
+    return [project_id for (project_id,) in db.query(Project.id).order_by(Project.id)]
 
 
 @with_db_session
 def get_project_by_id(project_id: int, db: Session) -> ProjectSchema:
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = (
+        db.query(Project)
+        .options(*PROJECT_SCHEMA_OPTIONS)
+        .filter(Project.id == project_id)
+        .first()
+    )
     return ProjectSchema.model_validate(project)
 
 
@@ -48,6 +177,7 @@ def update_project(
     project.description = payload.description
     project.moderator_id = payload.moderator_id
     project.sheet_id = payload.sheet_id
+    project.score_max_age = payload.score_max_age
 
     db.add(project)
     db.commit()
@@ -55,44 +185,388 @@ def update_project(
 
 
 @with_db_session
-def delete_project(project_id: int, db: Session) -> ProjectSchema:
-    project = db.query(Project).filter(Project.id == project_id).first()
+def delete_project(project_id: int, db: Session) -> ProjectSchema | None:
+    project = (
+        db.query(Project)
+        .options(*PROJECT_SCHEMA_OPTIONS)
+        .filter(Project.id == project_id)
+        .first()
+    )
+    if project is None:
+        return None
+
+    # Serialized first, the instance is detached once the delete is committed
+    deleted = ProjectSchema.model_validate(project)
     db.delete(project)
     db.commit()
-    return ProjectSchema.model_validate(project)
+    return deleted
+
+
+@with_db_session
+def get_project_detail_version(project_id: int, db: Session) -> tuple:
+    """
+    Update times of everything the detail document is built from, read
+    without loading smm_data.
+    """
+    version = (
+        db.query(Project.id, Project.updated_at, User.updated_at, Sheet.updated_at)
+        .outerjoin(Project.moderator)
+        .outerjoin(Project.sheet)
+        .filter(Project.id == project_id)
+        .first()
+    )
+    if version is None:
+        raise DataNotFoundException(entity_name="project")
+
+    return tuple(version)
+
+
+def submit_project_scores(project_id: int, full_rebuild: bool = False) -> Job:
+    return job_manager.submit(
+        project_scores_job_key(project_id),
+        calculate_project_scores,
+        project_id,
+        return_data=True,
+        full_rebuild=full_rebuild,
+    )
+
+
+@with_db_session
+def get_score_freshness(project_id: int, db: Session) -> tuple:
+    row = (
+        db.query(
+            Project.smm_computed_at,
+            Project.score_max_age,
+            Project.smm_data.is_(None),
+            Project.smm_failed_at,
+        )
+        .filter(Project.id == project_id)
+        .first()
+    )
+    if row is None:
+        raise DataNotFoundException(entity_name="project")
+
+    return tuple(row)
+
+
+@with_db_session
+def get_score_computed_at(project_id: int, db: Session) -> datetime | None:
+    return db.query(Project.smm_computed_at).filter(Project.id == project_id).scalar()
+
+
+def is_backing_off(failed_at: datetime | None) -> bool:
+    if failed_at is None:
+        return False
+
+    age = datetime.now(UTC) - failed_at.replace(tzinfo=UTC)
+    return age.total_seconds() < settings.SCORE_RETRY_BACKOFF
+
+
+def revalidate_project_scores(project_id: int) -> ScoreFreshnessSchema:
+    """
+    Stale-while-revalidate: stale scores start a background refresh (joined
+    with one in flight) and are served as they are. Scores never calculated
+    are waited for, up to settings.SCORE_WAIT_TIMEOUT, with no session open.
+    For settings.SCORE_RETRY_BACKOFF seconds after a failed recalculation,
+    views start no new one.
+    """
+    computed_at, max_age, missing, failed_at = get_score_freshness(project_id)
+    max_age = max_age or settings.SCORE_MAX_AGE
+    backing_off = is_backing_off(failed_at)
+    if missing and backing_off:
+        raise ScoreCalculationException("Score calculation failed, retrying later")
+    if missing:
+        job = submit_project_scores(project_id)
+        if not job.wait(settings.SCORE_WAIT_TIMEOUT):
+            raise ServiceBusyException("Scores are still being calculated")
+        if job.status == JobStatus.FAILED:
+            raise ScoreCalculationException(f"Score calculation failed: {job.error}")
+
+        return ScoreFreshnessSchema(
+            computed_at=get_score_computed_at(project_id),
+            max_age=max_age,
+            state="fresh",
+        )
+
+    # Scores from before computed_at was recorded count as stale
+    if computed_at is not None:
+        age = datetime.now(UTC) - computed_at.replace(tzinfo=UTC)
+        if age.total_seconds() < max_age:
+            return ScoreFreshnessSchema(
+                computed_at=computed_at, max_age=max_age, state="fresh"
+            )
+
+    if backing_off:
+        return ScoreFreshnessSchema(
+            computed_at=computed_at,
+            max_age=max_age,
+            state="stale",
+            refresh_failed_at=failed_at,
+        )
+
+    return ScoreFreshnessSchema(
+        computed_at=computed_at,
+        max_age=max_age,
+        state="stale",
+        refresh_job_id=submit_project_scores(project_id).id,
+    )
 
 
-def get_project_detail(project_id: int):
+def get_project_detail(project_id: int, freshness: ScoreFreshnessSchema) -> dict:
     data = get_project_by_id(project_id).model_dump()
     scores = data.pop("smm_data")
-    if scores is not None:
-        return {**scores, "project_data": data}
+    return {**scores, "project_data": data, "freshness": freshness}
 
-    smm_scores = calculate_project_scores(project_id, return_data=True)
 
-    return {**smm_scores, "project_data": data}
+def rebuild_scores(source: ResponseSource) -> Tuple[dict, dict]:
+    """
+    Score every row of the source, returning the scores and the new state.
+    """
+    responses = source.get_rows()
+    update_job_progress("scoring", 0.6)
+    codes = encode_responses(responses[1:])
+    counts = count_answers(codes)
+    num_of_rows = codes.shape[0]
+    edit_markers = source.get_edit_markers(num_of_rows + 1)
 
+    state = make_score_state(counts, num_of_rows, responses[-1], edit_markers)
+    data = {
+        **score_counts(counts, num_of_rows),
+        "project_members": get_project_members(responses),
+    }
+    return data, state
 
-@with_db_session
-def calculate_project_scores(
-    project_id: int, return_data: bool = False, db: Session = None
-):
-    form_sheet = get_form_sheet(project_id)
-    project_members = get_project_members(form_sheet)
-    result = calculate_smm_score(form_sheet)
 
+def apply_new_responses(
+    source: ResponseSource, state: dict | None, smm_data: dict | None
+) -> Tuple[dict, dict] | None:
+    """
+    Fold the rows appended since the last calculation into the stored counts.
+    Returns None when earlier rows were edited or deleted and a full rebuild
+    is needed.
+    """
+    if state is None or smm_data is None or "prefix_hash" not in state:
+        return None
+
+    # Re-read the last processed row to check the history is unchanged
+    responses = source.get_rows(start_row=state["last_row"])
+    if not responses or fingerprint_row(responses[0]) != state["last_row_hash"]:
+        return None
+
+    # Edits of earlier responses show in their edit markers, read narrowly
+    num_of_rows = state["num_of_rows"] + len(responses) - 1
+    edit_markers = source.get_edit_markers(num_of_rows + 1)
+    if fingerprint_row(edit_markers[: state["num_of_rows"]]) != state["prefix_hash"]:
+        return None
+
+    update_job_progress("scoring", 0.6)
+
+    counts = np.array(state["counts"], dtype=np.int64)
+    codes = encode_responses(responses[1:])
+    new_counts = count_answers(codes)
+    if counts.shape != new_counts.shape:
+        return None
+
+    counts += new_counts
+
+    state = make_score_state(counts, num_of_rows, responses[-1], edit_markers)
     data = {
-        **result,
-        "project_members": project_members,
+        **score_counts(counts, num_of_rows),
+        # The first row was already processed, it is skipped like a header
+        "project_members": smm_data["project_members"] + get_project_members(responses),
     }
+    return data, state
+
+
+def is_unchanged(
+    state: dict | None, smm_data: dict | None, signature: str | None
+) -> bool:
+    return (
+        signature is not None
+        and smm_data is not None
+        and state is not None
+        and state.get("signature") == signature
+    )
+
 
+@with_db_session
+def get_score_inputs(project_id: int, db: Session):
+    """
+    Source and stored state of a project, read in a session of its own so no
+    connection is held while the source is queried.
+    """
+    inputs = (
+        db.query(
+            Sheet.source_type, Sheet.sheet_filename, Project.smm_state, Project.smm_data
+        )
+        .join(Project.sheet)
+        .filter(Project.id == project_id)
+        .first()
+    )
+    if inputs is None:
+        raise DataNotFoundException(entity_name="project")
+
+    return inputs
+
+
+@with_db_session
+def touch_project_scores(project_id: int, db: Session):
     project = db.query(Project).filter(Project.id == project_id).first()
+    project.smm_computed_at = datetime.now(UTC)
+    project.smm_failed_at = None
+    db.commit()
+
+
+@with_db_session
+def record_score_failure(project_id: int, db: Session):
+    db.query(Project).filter(Project.id == project_id).update(
+        {Project.smm_failed_at: datetime.now(UTC)}, synchronize_session=False
+    )
+    db.commit()
+
+
+@with_db_session
+def save_project_scores(project_id: int, data: dict, state: dict, db: Session):
+    project = db.query(Project).filter(Project.id == project_id).first()
+    project.smm_state = state
     project.smm_data = data
+    project.smm_level = achieved_level(data["level_scores"])
+    num_of_rows = state["num_of_rows"]
+    replace_score_run(project, data, num_of_rows, db)
+    project.smm_computed_at = datetime.now(UTC)
+    project.smm_failed_at = None
+    record_snapshot(project, data, num_of_rows, project.smm_computed_at, db)
 
     db.add(project)
     db.commit()
 
+
+def calculate_project_scores(
+    project_id: int, return_data: bool = False, full_rebuild: bool = False
+):
+    try:
+        return compute_project_scores(project_id, return_data, full_rebuild)
+    except DataNotFoundException:
+        raise
+    except Exception:
+        # Views back off from refreshing until settings.SCORE_RETRY_BACKOFF
+        record_score_failure(project_id)
+        raise
+
+
+def compute_project_scores(project_id: int, return_data: bool, full_rebuild: bool):
+    update_job_progress("checking", 0.05)
+    inputs = get_score_inputs(project_id)
+    source = get_response_source(inputs)
+
+    # Read before the rows: a change in between only causes another fetch
+    signature = source.get_signature()
+    if not full_rebuild and is_unchanged(inputs.smm_state, inputs.smm_data, signature):
+        metrics.counter("project_scores_unchanged_total").inc()
+        touch_project_scores(project_id)
+        return inputs.smm_data if return_data else True
+
+    metrics.counter("project_scores_recalculated_total").inc()
+    update_job_progress("fetching", 0.1)
+    result = None
+    if not full_rebuild:
+        result = apply_new_responses(source, inputs.smm_state, inputs.smm_data)
+    data, state = result or rebuild_scores(source)
+
+    update_job_progress("saving", 0.9)
+    save_project_scores(project_id, data, {**state, "signature": signature})
+
     if return_data:
         return data
 
     return True
+
+
+def project_scores_job_key(project_id: int) -> str:
+    return f"project-scores:{project_id}"
+
+
+@with_db_session
+def enqueue_project_scores(
+    project_id: int, full_rebuild: bool = False, db: Session = None
+) -> JobSchema:
+    """
+    Queue a score recalculation, joining the one already in flight for this
+    project if there is one.
+    """
+    if db.query(Project.id).filter(Project.id == project_id).first() is None:
+        raise DataNotFoundException(entity_name="project")
+
+    job = submit_project_scores(project_id, full_rebuild=full_rebuild)
+    return JobSchema.model_validate(job)
+
+
+def recalculate_project_timed(project_id: int, full_rebuild: bool = False) -> dict:
+    start = time.perf_counter()
+    try:
+        # Single-flight with manual and stale-while-revalidate recalculations,
+        # which would otherwise race this one on smm_data
+        job = job_manager.run(
+            project_scores_job_key(project_id),
+            calculate_project_scores,
+            project_id,
+            timeout=settings.BULK_RECALCULATE_WAIT_TIMEOUT,
+            full_rebuild=full_rebuild,
+        )
+        status, error = job.status, job.error
+    except Exception as e:
+        status, error = "FAILED", str(e)
+
+    return {
+        "project_id": project_id,
+        "status": status,
+        "error": error,
+        "elapsed": round(time.perf_counter() - start, 3),
+    }
+
+
+def recalculate_all_projects(
+    concurrency: int | None = None, full_rebuild: bool = False
+) -> dict:
+    """
+    Recalculate every project on at most `concurrency` threads and report the
+    timing and outcome of each one.
+    """
+    concurrency = min(
+        concurrency or settings.BULK_RECALCULATE_CONCURRENCY,
+        settings.BULK_RECALCULATE_MAX_CONCURRENCY,
+    )
+    project_ids = get_project_ids()
+    start = time.perf_counter()
+
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(recalculate_project_timed, project_id, full_rebuild)
+            for project_id in project_ids
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            results.append(future.result())
+            update_job_progress("recalculating", done / len(futures))
+
+    failed = [r for r in results if r["status"] == "FAILED"]
+    return {
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "concurrency": concurrency,
+        "elapsed": round(time.perf_counter() - start, 3),
+        "projects": sorted(results, key=lambda r: r["project_id"]),
+    }
+
+
+def enqueue_all_project_scores(
+    concurrency: int | None = None, full_rebuild: bool = False
+) -> JobSchema:
+    job = job_manager.submit(
+        "project-scores:all",
+        recalculate_all_projects,
+        concurrency=concurrency,
+        full_rebuild=full_rebuild,
+    )
+    return JobSchema.model_validate(job)
@@ -0,0 +1,163 @@
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.core.config import settings, GSHEET_RESPONSE_RANGE, GSHEET_TIMESTAMP_COLUMN
+from app.core.gsheet import gsheet_client
+from app.core.utilities import column_to_num
+from app.models.sheet import Sheet
+from app.services.gsheet import (
+    get_form_sheet,
+    get_form_responses,
+    get_form_timestamps,
+)
+
+
+class ResponseSource(ABC):
+    """
+    Where the "Form Responses 1" answers of a project are read from. Rows hold
+    the GSHEET_RESPONSE_RANGE columns and row 1 is the header.
+    """
+
+    @abstractmethod
+    def get_rows(self, start_row: int = 1) -> List[List[str]]:
+        pass
+
+    @abstractmethod
+    def get_edit_markers(self, end_row: int) -> List[str]:
+        """
+        One value per response in rows 2 to end_row that changes when the
+        response is edited, read without fetching the answers.
+        """
+        pass
+
+    def get_signature(self) -> Optional[str]:
+        """
+        Cheap value that changes whenever the rows may have changed, or None
+        when the source cannot tell and must always be read.
+        """
+        return None
+
+
+class GoogleSheetResponseSource(ResponseSource):
+    def __init__(self, sheet_filename: str):
+        self.sheet_filename = sheet_filename
+        self._form_sheet = None
+
+    @property
+    def form_sheet(self):
+        if self._form_sheet is None:
+            self._form_sheet = get_form_sheet(self.sheet_filename)
+
+        return self._form_sheet
+
+    def get_rows(self, start_row: int = 1) -> List[List[str]]:
+        return get_form_responses(self.form_sheet, start_row)
+
+    def get_edit_markers(self, end_row: int) -> List[str]:
+        return get_form_timestamps(self.form_sheet, end_row)
+
+    def get_signature(self) -> Optional[str]:
+        return f"gsheet:{gsheet_client.get_drive_version(self.sheet_filename)}"
+
+
+class FileResponseSource(ResponseSource):
+    """
+    CSV or Parquet export of the whole response sheet, starting at column A,
+    stored under RESPONSE_FILES_DIR.
+    """
+
+    def __init__(self, path: str):
+        base = os.path.realpath(settings.RESPONSE_FILES_DIR)
+        self.path = os.path.realpath(os.path.join(base, path))
+        if os.path.commonpath([base, self.path]) != base:
+            raise ValueError(f"{path} is outside of the response files directory")
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_signature: Optional[str] = None
+
+    def read(self) -> pd.DataFrame:
+        """
+        The parsed file, cached for as long as the file is unchanged: a
+        recalculation reads both its rows and its edit markers.
+        """
+        signature = self.get_signature()
+        if self._frame is None or self._frame_signature != signature:
+            self._frame = self.parse()
+            self._frame_signature = signature
+
+        return self._frame
+
+    def parse(self) -> pd.DataFrame:
+        if self.path.endswith(".parquet"):
+            frame = pd.read_parquet(self.path)
+            # Parquet keeps the header as column names
+            header = pd.DataFrame([frame.columns], columns=frame.columns)
+            frame = pd.concat([header, frame], ignore_index=True)
+        else:
+            frame = pd.read_csv(
+                self.path, header=None, dtype=str, keep_default_na=False
+            )
+
+        return frame.fillna("").astype(str)
+
+    def get_signature(self) -> Optional[str]:
+        stat = os.stat(self.path)
+        return f"file:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def get_rows(self, start_row: int = 1) -> List[List[str]]:
+        first = column_to_num(GSHEET_RESPONSE_RANGE[0]) - 1
+        last = column_to_num(GSHEET_RESPONSE_RANGE[1])
+        frame = self.read()
+        return frame.iloc[start_row - 1 :, first:last].values.tolist()
+
+    def get_edit_markers(self, end_row: int) -> List[str]:
+        column = column_to_num(GSHEET_TIMESTAMP_COLUMN) - 1
+        return self.read().iloc[1:end_row, column].tolist()
+
+
+class InMemoryResponseSource(ResponseSource):
+    def __init__(self, rows: List[List[str]]):
+        self.rows = rows
+
+    def get_rows(self, start_row: int = 1) -> List[List[str]]:
+        return self.rows[start_row - 1 :]
+
+    def get_edit_markers(self, end_row: int) -> List[str]:
+        # No timestamp column, the rows themselves are cheap to compare
+        return ["\x1f".join(row) for row in self.rows[1:end_row]]
+
+    def get_signature(self) -> Optional[str]:
+        digest = hashlib.sha1()
+        for row in self.rows:
+            digest.update("\x1f".join(row).encode())
+            digest.update(b"\x1e")
+        return f"memory:{digest.hexdigest()}"
+
+
+# Fixtures registered by name, for Sheet rows with source_type "memory"
+memory_sources: Dict[str, InMemoryResponseSource] = {}
+
+
+def register_memory_source(name: str, rows: List[List[str]]) -> InMemoryResponseSource:
+    source = InMemoryResponseSource(rows)
+    memory_sources[name] = source
+    return source
+
+
+def get_response_source(sheet: Sheet) -> ResponseSource:
+    if sheet.source_type == "file":
+        return FileResponseSource(sheet.sheet_filename)
+
+    if sheet.source_type == "memory":
+        source = memory_sources.get(sheet.sheet_filename)
+        if source is None:
+            raise ValueError(
+                f"No in-memory response source {sheet.sheet_filename!r} is "
+                "registered in this process"
+            )
+        return source
+
+    return GoogleSheetResponseSource(sheet.sheet_filename)
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import List, Type
 from sqlalchemy.orm import Session
 
 from app.models.role import Role
@@ -8,3 +8,8 @@ from app.db.session import with_db_session
 @with_db_session
 def get_role(role_name: str, db: Session) -> Type[Role] | None:
     return db.query(Role).filter(Role.role_name == role_name).first()
+
+
+@with_db_session
+def get_roles(db: Session) -> List[Role]:
+    return db.query(Role).all()
@@ -0,0 +1,233 @@
+import hashlib
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import List
+
+import numpy as np
+
+from app.core.config import (
+    GSHEET_COLUMNS,
+    GSHEET_RESPONSE_RANGE,
+    SECTION_GROUPS,
+    LEVEL_CONSTANT,
+)
+from app.core.utilities import column_to_num, get_score_category
+
+ANSWERS = ["Ya", "Sebagian", "Tidak", "Tidak Berlaku"]
+# Code 0 is kept for blank or unrecognised cells
+ANSWER_CODES = {answer: code for code, answer in enumerate(ANSWERS, start=1)}
+
+
+class ScoringPlan:
+    """
+    Index plan compiled once from GSHEET_COLUMNS, SECTION_GROUPS and
+    LEVEL_CONSTANT. Column offsets are relative to GSHEET_RESPONSE_RANGE.
+    """
+
+    def __init__(self):
+        base = column_to_num(GSHEET_RESPONSE_RANGE[0])
+        self.width = column_to_num(GSHEET_RESPONSE_RANGE[1]) - base + 1
+        self.sections = list(GSHEET_COLUMNS.keys())
+
+        columns = []
+        section_of_column = []
+        for index, (start, *rest) in enumerate(GSHEET_COLUMNS.values()):
+            end = rest[-1] if rest else start
+            for column in range(column_to_num(start), column_to_num(end) + 1):
+                columns.append(column - base)
+                section_of_column.append(index)
+
+        self.columns = np.array(columns, dtype=np.intp)
+        self.pick = itemgetter(*columns)
+        # (questions x sections) 0/1 matrix folding column counts into sections
+        self.membership = np.zeros((len(columns), len(self.sections)), dtype=np.int64)
+        self.membership[np.arange(len(columns)), section_of_column] = 1
+        self.questions_per_section = self.membership.sum(axis=0)
+
+        section_index = {name: i for i, name in enumerate(self.sections)}
+        self.groups = [
+            (group, [section_index[s] for s in sections])
+            for group, sections in SECTION_GROUPS.items()
+        ]
+        group_index = {group: i for i, group in enumerate(SECTION_GROUPS)}
+        self.levels = [
+            (level, groups, [group_index[g] for g in groups])
+            for level, groups in LEVEL_CONSTANT.items()
+        ]
+
+
+PLAN = ScoringPlan()
+
+
+def encode_responses(rows: List[List[str]]) -> np.ndarray:
+    """
+    Encode response rows (no header) into a (rows x questions) int8 matrix of
+    ANSWER_CODES, keeping only the question columns of the plan.
+    """
+    width = PLAN.width
+    # The API trims trailing empty cells, so short rows are padded first
+    cells = chain.from_iterable(
+        PLAN.pick(row if len(row) >= width else row + [""] * (width - len(row)))
+        for row in rows
+    )
+    codes = np.fromiter(
+        map(ANSWER_CODES.get, cells, repeat(0)),
+        dtype=np.int8,
+        count=len(rows) * len(PLAN.columns),
+    )
+    return codes.reshape(len(rows), len(PLAN.columns))
+
+
+def count_answers(codes: np.ndarray) -> np.ndarray:
+    """
+    Count every answer per section, returned as a (sections x ANSWERS) matrix.
+    """
+    per_column = np.zeros((codes.shape[1], len(ANSWERS)), dtype=np.int64)
+    mask = np.empty(codes.shape, dtype=bool)
+    for answer, code in enumerate(ANSWER_CODES.values()):
+        np.equal(codes, code, out=mask)
+        per_column[:, answer] = np.count_nonzero(mask, axis=0)
+
+    return PLAN.membership.T @ per_column
+
+
+def calculate_section_scores(counts: np.ndarray, num_of_rows: int) -> List[float]:
+    ya, sebagian, _, not_applicable = counts.T
+    applicable = PLAN.questions_per_section * num_of_rows - not_applicable
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = (ya + (0.5 * sebagian)) / applicable * 100
+
+    # Round in Python so results stay identical to the per-section scoring
+    return [
+        round(score, 2) if n else 0
+        for score, n in zip(scores.tolist(), applicable.tolist())
+    ]
+
+
+def calculate_group(section_scores: List[float]) -> float:
+    score = sum(section_scores) / len(section_scores)
+    return round(score, 2)
+
+
+def calculate_level(group_scores: List[float]) -> float:
+    score = sum(group_scores) / len(group_scores)
+    return round(score, 2)
+
+
+def score_counts(counts: np.ndarray, num_of_rows: int) -> dict:
+    """
+    Derive the group and level score document from per-section answer counts.
+    """
+    section_scores = calculate_section_scores(counts, num_of_rows)
+
+    group_totals = []
+    group_scores = []
+    for group, indexes in PLAN.groups:
+        total_kpa = calculate_group([section_scores[i] for i in indexes])
+        group_totals.append(total_kpa)
+        group_scores.append(
+            {
+                "goal": group,
+                "objectives": [
+                    {"objective": PLAN.sections[i], "kpa": section_scores[i]}
+                    for i in indexes
+                ],
+                "totalKPA": total_kpa,
+                "interpretation": get_score_category(total_kpa),
+            }
+        )
+
+    level_scores = []
+    for level, groups, indexes in PLAN.levels:
+        level_score = calculate_level([group_totals[i] for i in indexes])
+        level_scores.append(
+            {
+                "level": level,
+                "goals": groups,
+                "kpaRating": level_score,
+                "interpretation": get_score_category(level_score),
+            }
+        )
+
+    return {
+        "group_scores": group_scores,
+        "level_scores": level_scores,
+    }
+
+
+def achieved_level(level_scores: List[dict]) -> str | None:
+    """
+    Highest level reached with every level up to it at least "Largely
+    Achieved", or None when even the first one is not.
+    """
+    achieved = None
+    for level in level_scores:
+        if level["interpretation"] not in ("Fully Achieved", "Largely Achieved"):
+            break
+        achieved = level["level"]
+
+    return achieved
+
+
+# Scores are stored as little-endian uint16 hundredths of a point
+PACKED_SCORE_DTYPE = np.dtype("<u2")
+
+
+def pack_scores(data: dict) -> bytes:
+    """
+    Section, group and level scores of a score document, in plan order,
+    packed into 2 bytes each.
+    """
+    values = [
+        objective["kpa"]
+        for group in data["group_scores"]
+        for objective in group["objectives"]
+    ]
+    values += [group["totalKPA"] for group in data["group_scores"]]
+    values += [level["kpaRating"] for level in data["level_scores"]]
+    return np.rint(np.array(values) * 100).astype(PACKED_SCORE_DTYPE).tobytes()
+
+
+def unpack_scores(packed: bytes) -> dict:
+    """
+    Inverse of pack_scores, keyed by section, group and level name.
+    """
+    values = (np.frombuffer(packed, dtype=PACKED_SCORE_DTYPE) / 100).tolist()
+    sections = [PLAN.sections[i] for _, indexes in PLAN.groups for i in indexes]
+    groups = [group for group, _ in PLAN.groups]
+    levels = [level for level, _, _ in PLAN.levels]
+
+    first_group = len(sections)
+    first_level = first_group + len(groups)
+    return {
+        "sections": dict(zip(sections, values[:first_group])),
+        "groups": dict(zip(groups, values[first_group:first_level])),
+        "levels": dict(zip(levels, values[first_level:])),
+    }
+
+
+def fingerprint_row(row: List[str]) -> str:
+    return hashlib.sha1("\x1f".join(row).encode()).hexdigest()
+
+
+def make_score_state(
+    counts: np.ndarray, num_of_rows: int, last_row: List[str], edit_markers: List[str]
+) -> dict:
+    """
+    Incremental state stored with the project: the sheet row of the last
+    processed response (row 1 is the header), fingerprints of it and of the
+    edit markers of every processed response, and the per-section answer
+    counts so far.
+    """
+    return {
+        "last_row": num_of_rows + 1,
+        "last_row_hash": fingerprint_row(last_row),
+        "prefix_hash": fingerprint_row(edit_markers),
+        "num_of_rows": num_of_rows,
+        "counts": counts.tolist(),
+    }
+
+
+def calculate_smm_score(responses: List[List[str]]) -> dict:
+    codes = encode_responses(responses[1:])
+    return score_counts(count_answers(codes), codes.shape[0])
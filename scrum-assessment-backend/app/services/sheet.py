@@ -1,27 +1,56 @@
-from typing import List, Type
+from typing import List, Optional, Tuple, Type
 
 from sqlalchemy.orm import Session
 
+from app.db.pagination import paginate, search_pattern
 from app.db.session import with_db_session
 
 from app.models.project import Project
 from app.models.sheet import Sheet
-from app.schemas.sheet import CreateUpdateSheetRequest
+from app.schemas.pagination import SheetListParams
+from app.schemas.sheet import CreateUpdateSheetRequest, SheetSchema
+
+
+SHEET_SORT_COLUMNS = {
+    "id": Sheet.id,
+    "sheet_filename": Sheet.sheet_filename,
+    "created_at": Sheet.created_at,
+}
 
 
 @with_db_session
-def get_sheets(db: Session) -> List[Type[Sheet]]:
-    return db.query(Sheet).all()
+def get_sheets(
+    params: SheetListParams, db: Session
+) -> Tuple[List[SheetSchema], Optional[str]]:
+    query = db.query(Sheet)
+    if params.fill_form_status is not None:
+        query = query.filter(Sheet.fill_form_status == params.fill_form_status)
+
+    if params.search:
+        query = query.filter(
+            Sheet.sheet_filename.ilike(search_pattern(params.search), escape="\\")
+        )
+
+    sheets, next_cursor = paginate(
+        query,
+        params.sort,
+        SHEET_SORT_COLUMNS,
+        Sheet.id,
+        params.cursor,
+        params.limit,
+    )
+    return [SheetSchema.model_validate(s) for s in sheets], next_cursor
 
 
 @with_db_session
-def get_sheets_available(db: Session) -> List[Sheet]:
-    return (
+def get_sheets_available(db: Session) -> List[SheetSchema]:
+    sheets = (
         db.query(Sheet)
         .outerjoin(Project, Project.sheet_id == Sheet.id)
         .filter(Project.sheet_id.is_(None))
         .all()
     )
+    return [SheetSchema.model_validate(s) for s in sheets]
 
 @with_db_session
 def get_sheet_by_id(sheet_id, db: Session) -> Type[Sheet]:
@@ -32,6 +61,7 @@ def get_sheet_by_id(sheet_id, db: Session) -> Type[Sheet]:
 def create_sheet(sheet_data: CreateUpdateSheetRequest, db: Session) -> Sheet:
     sheet = Sheet(
         sheet_filename=sheet_data.sheet_filename,
+        source_type=sheet_data.source_type,
         description=sheet_data.description,
         form_link=sheet_data.form_link,
         fill_form_status=True,
@@ -49,6 +79,7 @@ def update_sheet(
 ) -> Type[Sheet]:
     sheet = get_sheet_by_id(sheet_id)
     sheet.sheet_filename = sheet_data.sheet_filename
+    sheet.source_type = sheet_data.source_type
     sheet.description = sheet_data.description
     sheet.form_link = sheet_data.form_link
     sheet.fill_form_status = sheet_data.fill_form_status
@@ -1,10 +1,16 @@
-from typing import List, Type
+from typing import List, Optional, Set, Tuple, Type
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import or_
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.principal_cache import principal_cache
 from app.models import Role
 from app.models.user import User
+from app.db.pagination import paginate, search_pattern
 from app.db.session import with_db_session
+from app.schemas.pagination import UserListParams
+from app.schemas.user import UserSchema
 from app.services.role import get_role
 
 
@@ -46,9 +52,38 @@ def get_user_by_role(role_id: int, db: Session) -> User | None:
     return user
 
 
+USER_SORT_COLUMNS = {
+    "id": User.id,
+    "username": User.username,
+    "email": User.email,
+    "created_at": User.created_at,
+}
+
+
 @with_db_session
-def get_users(db: Session) -> List[User] | None:
-    return db.query(User).options(joinedload(User.role)).all()
+def get_users(params: UserListParams, db: Session) -> Tuple[List[User], Optional[str]]:
+    query = db.query(User).options(joinedload(User.role))
+    if params.role:
+        role_id = (
+            select(Role.id)
+            .where(Role.role_name == params.role.upper())
+            .scalar_subquery()
+        )
+        query = query.filter(User.role_id == role_id)
+
+    if params.search:
+        pattern = search_pattern(params.search)
+        query = query.filter(
+            or_(
+                User.username.ilike(pattern, escape="\\"),
+                User.email.ilike(pattern, escape="\\"),
+                User.fullname.ilike(pattern, escape="\\"),
+            )
+        )
+
+    return paginate(
+        query, params.sort, USER_SORT_COLUMNS, User.id, params.cursor, params.limit
+    )
 
 
 @with_db_session
@@ -78,6 +113,51 @@ def create_user(
     return user_with_role
 
 
+@with_db_session
+def get_existing_usernames_and_emails(
+    usernames: List[str], emails: List[str], db: Session
+) -> Tuple[Set[str], Set[str]]:
+    rows = (
+        db.query(User.username, User.email)
+        .filter(or_(User.username.in_(usernames), User.email.in_(emails)))
+        .all()
+    )
+
+    return {row.username for row in rows}, {row.email for row in rows}
+
+
+@with_db_session
+def create_users(users: List[dict], db: Session) -> List[Optional[int]]:
+    """
+    Insert many users in a single transaction, returning their ids. When a
+    concurrent insert took a username or email, the rows are retried in a
+    savepoint each and those that conflict get None instead of an id.
+    """
+    objects = [User(**user) for user in users]
+    try:
+        db.add_all(objects)
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        objects = [create_user_savepoint(user, db) for user in users]
+
+    ids = [user.id if user is not None else None for user in objects]
+    db.commit()
+
+    return ids
+
+
+def create_user_savepoint(user: dict, db: Session) -> User | None:
+    user = User(**user)
+    try:
+        with db.begin_nested():
+            db.add(user)
+    except IntegrityError:
+        return None
+
+    return user
+
+
 @with_db_session
 def update_user(
     user_id: int,
@@ -97,6 +177,7 @@ def update_user(
     db.add(user)
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate_user(user_id)
 
     user_with_role = (
         db.query(User).options(joinedload(User.role)).filter(User.id == user.id).first()
@@ -117,17 +198,21 @@ def update_user_role(
     db.add(user)
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate_user(user_id)
 
     return role
 
 
 @with_db_session
-def delete_user(user_id: int, db: Session) -> User | None:
+def delete_user(user_id: int, db: Session) -> UserSchema | None:
     user = get_user_by_id(user_id)
     if user is None:
         return None
 
+    # Serialized first, the role is expired and detached after the commit
+    deleted = UserSchema.model_validate(user)
     db.delete(user)
     db.commit()
+    principal_cache.invalidate_user(user_id)
 
-    return user
+    return deleted
@@ -0,0 +1,139 @@
+"""
+Measure bytes saved and CPU cost of each response encoding and level on
+score payloads and a streamed CSV of responses.
+
+    python -m benchmarks.compression --label v1
+    python -m benchmarks.compression --gzip-levels 1 6 9 --zstd-levels 1 3 10
+
+Results are written to benchmarks/results/compression-<label>.json.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import platform
+import time
+from datetime import datetime, UTC
+
+from app.core.compression import (
+    BrotliCompressor,
+    GzipCompressor,
+    ZstdCompressor,
+    brotli,
+    zstandard,
+)
+from app.core.serialization import dump_json
+from benchmarks.generators import generate_responses
+from benchmarks.serialization import make_cases
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+CSV_CHUNK_ROWS = 100
+
+
+def make_payloads(csv_rows: int):
+    """
+    (name, chunks) pairs: JSON bodies are sent in one chunk, the CSV export
+    in chunks of CSV_CHUNK_ROWS rows like a streaming response.
+    """
+    for name, content, exclude_unset in make_cases([100, 1_000], [100, 500]):
+        yield name, [dump_json(content, exclude_unset=exclude_unset)]
+
+    chunks = []
+    rows = generate_responses(csv_rows)
+    for start in range(0, len(rows), CSV_CHUNK_ROWS):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows[start : start + CSV_CHUNK_ROWS])
+        chunks.append(buffer.getvalue().encode())
+    yield f"csv/{csv_rows} rows", chunks
+
+
+def compress_chunks(factory, chunks: list, flush_size: int) -> int:
+    # Same flushing as CompressionResponder
+    compressor = factory()
+    size = 0
+    unflushed = 0
+    for chunk in chunks[:-1]:
+        size += len(compressor.compress(chunk))
+        unflushed += len(chunk)
+        if unflushed >= flush_size:
+            size += len(compressor.flush())
+            unflushed = 0
+
+    size += len(compressor.compress(chunks[-1]))
+    return size + len(compressor.finish())
+
+
+def measure(factory, chunks: list, flush_size: int, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = compress_chunks(factory, chunks, flush_size)
+        best = min(best, time.perf_counter() - start)
+
+    original = sum(map(len, chunks))
+    return {
+        "bytes_out": size,
+        "ratio": round(size / original, 4),
+        "bytes_saved": original - size,
+        "seconds": best,
+        "mib_per_second": round(original / 2**20 / best, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compression")
+    parser.add_argument("--label", default=datetime.now(UTC).strftime("%Y%m%d%H%M%S"))
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[1, 4, 11])
+    parser.add_argument("--zstd-levels", type=int, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--csv-rows", type=int, default=10_000)
+    parser.add_argument("--flush-size", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    encoders = [
+        (f"gzip-{level}", lambda level=level: GzipCompressor(level))
+        for level in args.gzip_levels
+    ]
+    if brotli is not None:
+        encoders += [
+            (f"br-{quality}", lambda quality=quality: BrotliCompressor(quality))
+            for quality in args.brotli_qualities
+        ]
+    if zstandard is not None:
+        encoders += [
+            (f"zstd-{level}", lambda level=level: ZstdCompressor(level))
+            for level in args.zstd_levels
+        ]
+
+    results = {
+        "label": args.label,
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": [],
+    }
+
+    for name, chunks in make_payloads(args.csv_rows):
+        original = sum(map(len, chunks))
+        print(f"{name} ({original / 1024:.1f} KiB in {len(chunks)} chunks)")
+        case = {"case": name, "bytes_in": original, "encodings": {}}
+        for encoder, factory in encoders:
+            result = measure(factory, chunks, args.flush_size, args.repeat)
+            case["encodings"][encoder] = result
+            print(
+                f"  {encoder:<10} {result['bytes_out'] / 1024:>9.1f} KiB  "
+                f"{result['ratio']:>7.1%}  {result['seconds'] * 1000:>9.3f} ms  "
+                f"{result['mib_per_second']:>8.1f} MiB/s"
+            )
+        results["cases"].append(case)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, f"compression-{args.label}.json"), "w") as file:
+        json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import GSHEET_RESPONSE_RANGE
+from app.core.utilities import column_to_num, num_to_column
+from app.services.scoring import ANSWERS
+
+# Probability of each of ANSWERS and of a blank cell, in that order
+DISTRIBUTIONS: Dict[str, List[float]] = {
+    "uniform": [0.2, 0.2, 0.2, 0.2, 0.2],
+    "mostly_yes": [0.7, 0.15, 0.1, 0.04, 0.01],
+    "mostly_not_applicable": [0.1, 0.05, 0.05, 0.8, 0.0],
+    "sparse": [0.15, 0.1, 0.1, 0.05, 0.6],
+}
+
+
+def generate_responses(
+    num_of_rows: int, distribution: str = "uniform", seed: int = 0
+) -> List[List[str]]:
+    """
+    Synthetic "Form Responses 1" block shaped like GSHEET_RESPONSE_RANGE: a
+    header row, a member name column and answer columns. Trailing blank cells
+    are trimmed like the Sheets API does.
+    """
+    first = column_to_num(GSHEET_RESPONSE_RANGE[0])
+    last = column_to_num(GSHEET_RESPONSE_RANGE[1])
+    header = [num_to_column(column) for column in range(first, last + 1)]
+
+    rng = np.random.default_rng(seed)
+    values = np.array(ANSWERS + [""], dtype=object)
+    picks = rng.choice(
+        len(values),
+        size=(num_of_rows, len(header) - 1),
+        p=DISTRIBUTIONS[distribution],
+    )
+
+    rows = [header]
+    for index, answers in enumerate(values[picks].tolist()):
+        row = [f"Member {index}"] + answers
+        while row[-1] == "":
+            row.pop()
+        rows.append(row)
+
+    return rows
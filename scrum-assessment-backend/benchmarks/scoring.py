@@ -0,0 +1,157 @@
+"""
+Benchmark the scoring pipeline (encode -> section counts -> group and level
+scores) on synthetic response sheets.
+
+    python -m benchmarks.scoring --label v1
+    python -m benchmarks.scoring --label v2 --baseline v1 --rows 10 1000 1000000
+
+Results are written to benchmarks/results/<label>.json. With --baseline, wall
+times are compared against an earlier run and slowdowns above --threshold
+are reported as regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, UTC
+
+from app.core.utilities import get_score_category
+from app.services.scoring import encode_responses, count_answers, score_counts
+from benchmarks.generators import DISTRIBUTIONS, generate_responses
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_ROWS = [10, 100, 1_000, 10_000, 100_000]
+
+
+def run_pipeline(responses):
+    codes = encode_responses(responses[1:])
+    counts = count_answers(codes)
+    return score_counts(counts, codes.shape[0])
+
+
+def time_stages(responses, repeat: int) -> dict:
+    best = {"encode": float("inf"), "count": float("inf"), "score": float("inf")}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        codes = encode_responses(responses[1:])
+        encoded = time.perf_counter()
+        counts = count_answers(codes)
+        counted = time.perf_counter()
+        score_counts(counts, codes.shape[0])
+        scored = time.perf_counter()
+
+        best["encode"] = min(best["encode"], encoded - start)
+        best["count"] = min(best["count"], counted - encoded)
+        best["score"] = min(best["score"], scored - counted)
+
+    best["total"] = best["encode"] + best["count"] + best["score"]
+    return best
+
+
+def measure_memory(responses) -> dict:
+    """
+    Peak bytes the pipeline had allocated at once, above what was already
+    traced when it started.
+    """
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    run_pipeline(responses)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"peak_allocated_bytes": peak - start}
+
+
+def time_score_category(repeat: int) -> float:
+    scores = [i / 100 for i in range(10_001)]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for score in scores:
+            get_score_category(score)
+        best = min(best, (time.perf_counter() - start) / len(scores))
+
+    return best
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    previous = {(r["rows"], r["distribution"]): r for r in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        old = previous.get((case["rows"], case["distribution"]))
+        if old is None:
+            continue
+
+        change = case["wall_time"]["total"] / old["wall_time"]["total"] - 1
+        case["change_vs_baseline"] = round(change, 4)
+        if change > threshold:
+            regressions.append(case)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.scoring")
+    parser.add_argument("--label", default=datetime.now(UTC).strftime("%Y%m%d%H%M%S"))
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument(
+        "--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=DISTRIBUTIONS
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", help="label of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = {
+        "label": args.label,
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "score_category_seconds": time_score_category(args.repeat),
+        "cases": [],
+    }
+
+    for num_of_rows in args.rows:
+        for distribution in args.distributions:
+            responses = generate_responses(num_of_rows, distribution)
+            # Fewer repeats on very large sheets
+            repeat = args.repeat if num_of_rows <= 100_000 else 1
+            case = {
+                "rows": num_of_rows,
+                "distribution": distribution,
+                "wall_time": time_stages(responses, repeat),
+                **measure_memory(responses),
+            }
+            results["cases"].append(case)
+            print(
+                f"{num_of_rows:>9} rows  {distribution:<22} "
+                f"{case['wall_time']['total'] * 1000:>10.2f} ms  "
+                f"{case['peak_allocated_bytes'] / 2**20:>9.2f} MiB peak"
+            )
+            del responses
+
+    regressions = []
+    if args.baseline:
+        with open(os.path.join(RESULTS_DIR, f"{args.baseline}.json")) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+
+        for case in regressions:
+            print(
+                f"REGRESSION {case['rows']} rows {case['distribution']}: "
+                f"{case['change_vs_baseline']:+.1%} vs {args.baseline}"
+            )
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, f"{args.label}.json"), "w") as file:
+        json.dump(results, file, indent=2)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
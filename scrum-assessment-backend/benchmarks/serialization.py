@@ -0,0 +1,180 @@
+"""
+Benchmark response serialization of score payloads: the stdlib JSONResponse
+after jsonable_encoder, ORJSONResponse after jsonable_encoder, and
+dump_json straight from the models.
+
+    python -m benchmarks.serialization --label v1
+    python -m benchmarks.serialization --members 10 1000 --projects 10 500
+
+Results are written to benchmarks/results/serialization-<label>.json.
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+from datetime import datetime, UTC
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.core.serialization import dump_json
+from app.schemas.project import ProjectSchema, ProjectSummarySchema
+from app.schemas.role import Role
+from app.schemas.sheet import SheetSchema
+from app.schemas.user import UserSchema
+from app.services.scoring import calculate_smm_score
+from benchmarks.generators import generate_responses
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_MEMBERS = [10, 100, 1_000]
+DEFAULT_PROJECTS = [10, 100, 500]
+# Naive like the timestamps read back from the database
+TIMESTAMP = datetime(2025, 1, 1, 12, 0, 0, 123456)
+
+ENCODERS = {
+    "stdlib": lambda content, exclude_unset: JSONResponse(
+        jsonable_encoder(content, exclude_unset=exclude_unset)
+    ).body,
+    "orjson": lambda content, exclude_unset: ORJSONResponse(
+        jsonable_encoder(content, exclude_unset=exclude_unset)
+    ).body,
+    "direct": dump_json,
+}
+
+
+def make_smm_data(num_of_members: int) -> dict:
+    responses = generate_responses(num_of_members)
+    return {
+        **calculate_smm_score(responses),
+        "project_members": [row[0] for row in responses[1:]],
+    }
+
+
+def make_project(project_id: int, smm_data: dict) -> ProjectSchema:
+    return ProjectSchema(
+        id=project_id,
+        name=f"Project {project_id}",
+        description="Synthetic project",
+        created_at=TIMESTAMP,
+        updated_at=TIMESTAMP,
+        smm_data=smm_data,
+        moderator=UserSchema(
+            id=project_id,
+            username=f"moderator{project_id}",
+            email=f"moderator{project_id}@example.com",
+            fullname=f"Moderator {project_id}",
+            role=Role(id=2, role_name="MODERATOR", description="Moderator"),
+            created_at=TIMESTAMP,
+            updated_at=TIMESTAMP,
+        ),
+        sheet=SheetSchema(
+            id=project_id,
+            sheet_filename=f"Sheet {project_id}",
+            source_type="gsheet",
+            description=None,
+            form_link="https://forms.example.com",
+            fill_form_status=True,
+            created_at=TIMESTAMP,
+            updated_at=TIMESTAMP,
+        ),
+    )
+
+
+def make_cases(members: list, projects: list):
+    for num_of_members in members:
+        smm_data = make_smm_data(num_of_members)
+        project = make_project(1, None).model_dump()
+        # Shaped like get_project_detail
+        yield f"detail/{num_of_members} members", {
+            **smm_data,
+            "project_data": project,
+        }, False
+
+    smm_data = make_smm_data(DEFAULT_MEMBERS[0])
+    for num_of_projects in projects:
+        yield f"list/{num_of_projects} projects", [
+            make_project(i, smm_data) for i in range(num_of_projects)
+        ], False
+        yield f"summary/{num_of_projects} projects", [
+            ProjectSummarySchema.model_validate(
+                {
+                    "id": i,
+                    "name": f"Project {i}",
+                    "moderator_name": f"Moderator {i}",
+                    "smm_level": "Level 2 (Managed)",
+                    "updated_at": TIMESTAMP,
+                }
+            )
+            for i in range(num_of_projects)
+        ], True
+
+
+def time_encoder(encode, content, exclude_unset: bool, repeat: int) -> float:
+    # Enough calls per round to keep timer resolution out of small payloads
+    number = max(1, 2_000 // max(1, len(content)))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            encode(content, exclude_unset)
+        best = min(best, (time.perf_counter() - start) / number)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--label", default=datetime.now(UTC).strftime("%Y%m%d%H%M%S"))
+    parser.add_argument("--members", type=int, nargs="+", default=DEFAULT_MEMBERS)
+    parser.add_argument("--projects", type=int, nargs="+", default=DEFAULT_PROJECTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {
+        "label": args.label,
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": [],
+    }
+
+    for name, content, exclude_unset in make_cases(args.members, args.projects):
+        bodies = {
+            encoder: encode(content, exclude_unset)
+            for encoder, encode in ENCODERS.items()
+        }
+        expected = json.loads(bodies["stdlib"])
+        for encoder, body in bodies.items():
+            if json.loads(body) != expected:
+                raise AssertionError(f"{encoder} output differs on {name}")
+
+        seconds = {
+            encoder: time_encoder(encode, content, exclude_unset, args.repeat)
+            for encoder, encode in ENCODERS.items()
+        }
+        case = {
+            "case": name,
+            "bytes": len(bodies["direct"]),
+            "seconds_per_request": seconds,
+        }
+        results["cases"].append(case)
+        print(
+            f"{name:<24} {case['bytes'] / 1024:>9.1f} KiB  "
+            + "  ".join(
+                f"{encoder} {value * 1000:>8.3f} ms"
+                for encoder, value in seconds.items()
+            )
+            + f"  {seconds['stdlib'] / seconds['direct']:>5.1f}x"
+        )
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(
+        os.path.join(RESULTS_DIR, f"serialization-{args.label}.json"), "w"
+    ) as file:
+        json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+# Settings are read from the environment when app is first imported
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("GSHEET_ACCOUNT_CREDENTIALS_FILE", "unused.json")
+os.environ.setdefault("MAIN_ADMIN_PASSWORD", "admin")
+os.environ.setdefault("MAIN_ADMIN_EMAIL", "admin@example.com")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+import pytest
+
+from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.models.project import Project
+from app.models.role import Role
+from app.models.sheet import Sheet
+from app.models.user import User
+
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    """
+    Roles, the main admin and a few moderators, sheets and projects.
+    """
+    init_db()
+    with SessionLocal() as db:
+        role = db.query(Role).filter(Role.role_name == "MODERATOR").one()
+        for i in range(3):
+            moderator = User(
+                username=f"moderator{i}",
+                email=f"moderator{i}@example.com",
+                fullname=f"Moderator {i}",
+                password="unused",
+                role=role,
+            )
+            sheet = Sheet(
+                sheet_filename=f"sheet{i}.csv",
+                source_type="file",
+                form_link="https://forms.example.com",
+                fill_form_status=True,
+            )
+            db.add(Project(name=f"Project {i}", moderator=moderator, sheet=sheet))
+        db.commit()
+        project_ids = [project_id for (project_id,) in db.query(Project.id)]
+
+    return {"project_ids": project_ids}
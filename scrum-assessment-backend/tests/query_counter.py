@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(bind=engine):
+    """
+    Record every SQL statement executed on `bind` inside the block.
+    """
+    counter = QueryCounter()
+    event.listen(bind, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_max_queries(limit: int, bind=engine):
+    """
+    Fail when the block runs more than `limit` statements, e.g. to catch N+1
+    lazy loads in listing tests.
+    """
+    with count_queries(bind) as counter:
+        yield counter
+
+    if counter.count > limit:
+        statements = "\n".join(counter.statements)
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {counter.count}:\n{statements}"
+        )
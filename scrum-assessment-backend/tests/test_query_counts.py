@@ -0,0 +1,59 @@
+from app.schemas.pagination import ProjectListParams, SheetListParams, UserListParams
+from app.schemas.user import UserSchema
+from app.services import project as project_service
+from app.services import sheet as sheet_service
+from app.services import user as user_service
+from app.services.response_source import InMemoryResponseSource
+from benchmarks.generators import generate_responses
+from tests.query_counter import assert_max_queries, count_queries
+
+
+def test_get_projects_runs_one_query(seeded_db):
+    with assert_max_queries(1):
+        projects, _ = project_service.get_projects(ProjectListParams())
+    assert len(projects) == len(seeded_db["project_ids"])
+
+
+def test_get_projects_with_all_fields_runs_one_query(seeded_db):
+    params = ProjectListParams(fields="description,created_at,moderator,sheet")
+    with assert_max_queries(1):
+        projects, _ = project_service.get_projects(params)
+    assert all(p.moderator.role.role_name == "MODERATOR" for p in projects)
+
+
+def test_get_users_runs_one_query(seeded_db):
+    with assert_max_queries(1):
+        users, _ = user_service.get_users(UserListParams())
+        # The role is serialized from the eager load, not lazily
+        users = [UserSchema.model_validate(user) for user in users]
+    assert {user.role.role_name for user in users} == {"ADMIN", "MODERATOR"}
+
+
+def test_get_sheets_runs_one_query(seeded_db):
+    with assert_max_queries(1):
+        sheets, _ = sheet_service.get_sheets(SheetListParams())
+    assert len(sheets) == 3
+
+
+def test_get_project_by_id_runs_one_query(seeded_db):
+    with assert_max_queries(1):
+        project = project_service.get_project_by_id(seeded_db["project_ids"][0])
+    assert project.sheet is not None and project.moderator.role is not None
+
+
+def test_save_project_scores_deletes_the_old_run_in_bulk(seeded_db):
+    project_id = seeded_db["project_ids"][0]
+    source = InMemoryResponseSource(generate_responses(5))
+    data, state = project_service.rebuild_scores(source)
+    project_service.save_project_scores(project_id, data, state)
+
+    with count_queries() as counter:
+        project_service.save_project_scores(project_id, data, state)
+
+    # One DELETE per score table and no score rows loaded to delete them
+    deletes = [s for s in counter.statements if s.startswith("DELETE")]
+    assert len(deletes) == 4
+    assert all("WHERE" in s and "project_id" in s for s in deletes)
+    selects = [s for s in counter.statements if s.startswith("SELECT")]
+    for table in ("score_runs", "section_scores", "group_scores", "level_scores"):
+        assert not [s for s in selects if f"FROM {table}" in s]
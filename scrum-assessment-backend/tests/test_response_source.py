@@ -0,0 +1,30 @@
+import csv
+import os
+
+from app.core.config import settings
+from app.services.response_source import FileResponseSource
+from benchmarks.generators import generate_responses
+
+
+def write_sheet(path: str, rows):
+    # Timestamp and email columns precede the response range
+    with open(path, "w", newline="") as file:
+        csv.writer(file).writerows([f"t{i}", ""] + row for i, row in enumerate(rows))
+
+
+def test_file_source_parses_once_per_file_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_FILES_DIR", str(tmp_path))
+    write_sheet(tmp_path / "sheet.csv", generate_responses(5))
+    source = FileResponseSource("sheet.csv")
+    parses = []
+    parse = source.parse
+    monkeypatch.setattr(source, "parse", lambda: parses.append(1) or parse())
+
+    rows = source.get_rows()
+    assert source.get_edit_markers(len(rows)) == [f"t{i}" for i in range(1, 6)]
+    assert len(parses) == 1
+
+    write_sheet(tmp_path / "sheet.csv", generate_responses(6))
+    os.utime(tmp_path / "sheet.csv", ns=(0, 0))
+    assert len(source.get_rows()) == 7
+    assert len(parses) == 2
@@ -0,0 +1,179 @@
+from typing import Dict, List
+
+import pandas as pd
+import pytest
+
+from app.core.config import (
+    GSHEET_COLUMNS,
+    GSHEET_RESPONSE_RANGE,
+    LEVEL_CONSTANT,
+    SECTION_GROUPS,
+)
+from app.core.utilities import column_to_num, get_score_category
+from app.services.project import apply_new_responses, is_unchanged, rebuild_scores
+from app.services.response_source import InMemoryResponseSource
+from app.services.scoring import calculate_smm_score
+from benchmarks.generators import DISTRIBUTIONS, generate_responses
+
+
+def get_range(rows: List[List[str]], start: str, end: str) -> List[List[str]]:
+    """
+    What Worksheet.get returns for the columns start:end of the sheet: the
+    rows up to the last one with a value, trailing empty cells trimmed.
+    """
+    first = column_to_num(start) - column_to_num(GSHEET_RESPONSE_RANGE[0])
+    last = column_to_num(end) - column_to_num(GSHEET_RESPONSE_RANGE[0]) + 1
+    records = [row[first:last] for row in rows]
+    records = [
+        row[: max((i + 1 for i, v in enumerate(row) if v), default=0)]
+        for row in records
+    ]
+    while records and not records[-1]:
+        records.pop()
+    return records
+
+
+def baseline_section(rows, key: str, columns: List[str]) -> Dict[str, float]:
+    """
+    The pandas section scoring that ran against the worksheet before the
+    NumPy pipeline.
+    """
+    records = get_range(rows, columns[0], columns[-1])
+    df = pd.DataFrame(records[1:], columns=records[0])
+    num_of_rows = df.shape[0]
+    counts = {
+        value: int((df == value).sum().sum())
+        for value in ["Ya", "Sebagian", "Tidak", "Tidak Berlaku"]
+    }
+    num_of_questions = num_of_rows * (
+        column_to_num(columns[-1]) - column_to_num(columns[0]) + 1
+    )
+    if num_of_questions - counts["Tidak Berlaku"] == 0:
+        return {key: 0}
+
+    score = (
+        (counts["Ya"] + 0.5 * counts["Sebagian"])
+        / (num_of_questions - counts["Tidak Berlaku"])
+        * 100
+    )
+    return {key: round(score, 2)}
+
+
+def baseline_smm_score(rows: List[List[str]]) -> dict:
+    sections = {}
+    for key, columns in GSHEET_COLUMNS.items():
+        sections.update(baseline_section(rows, key, columns))
+
+    group_scores = []
+    totals = {}
+    for goal, names in SECTION_GROUPS.items():
+        totals[goal] = round(sum(sections[n] for n in names) / len(names), 2)
+        group_scores.append(
+            {
+                "goal": goal,
+                "objectives": [{"objective": n, "kpa": sections[n]} for n in names],
+                "totalKPA": totals[goal],
+                "interpretation": get_score_category(totals[goal]),
+            }
+        )
+
+    level_scores = []
+    for level, goals in LEVEL_CONSTANT.items():
+        rating = round(sum(totals[g] for g in goals) / len(goals), 2)
+        level_scores.append(
+            {
+                "level": level,
+                "goals": goals,
+                "kpaRating": rating,
+                "interpretation": get_score_category(rating),
+            }
+        )
+
+    return {"group_scores": group_scores, "level_scores": level_scores}
+
+
+def answered_every_section(rows: List[List[str]]) -> List[List[str]]:
+    # Worksheet.get drops trailing rows left blank in a section, which the
+    # baseline then did not count, and the baseline DataFrame fails when no
+    # row reaches the end of a section. Answer the last question of every
+    # section in the last row, like a form with required questions
+    last = rows[-1] + [""] * (len(rows[0]) - len(rows[-1]))
+    first = column_to_num(GSHEET_RESPONSE_RANGE[0])
+    for start, *rest in GSHEET_COLUMNS.values():
+        cells = slice(
+            column_to_num(start) - first,
+            column_to_num(rest[-1] if rest else start) - first + 1,
+        )
+        if not last[cells.stop - 1]:
+            last[cells.stop - 1] = "Tidak"
+    return rows[:-1] + [last]
+
+
+@pytest.mark.parametrize("distribution", list(DISTRIBUTIONS))
+@pytest.mark.parametrize("num_of_rows", [1, 7, 250])
+def test_numpy_scoring_matches_baseline(distribution, num_of_rows):
+    rows = answered_every_section(
+        generate_responses(num_of_rows, distribution, seed=num_of_rows)
+    )
+    assert calculate_smm_score(rows) == baseline_smm_score(rows)
+
+
+def test_numpy_scoring_matches_baseline_when_nothing_applies():
+    rows = generate_responses(3, "uniform")
+    rows = [rows[0]] + [
+        [row[0]] + ["Tidak Berlaku"] * (len(rows[0]) - 1) for row in rows[1:]
+    ]
+    assert calculate_smm_score(rows) == baseline_smm_score(rows)
+
+
+@pytest.fixture
+def scored():
+    """
+    A source scored from scratch, with its stored scores and state.
+    """
+    source = InMemoryResponseSource(generate_responses(20, seed=1))
+    data, state = rebuild_scores(source)
+    return source, data, state
+
+
+def test_apply_new_responses_folds_appended_rows(scored):
+    source, data, state = scored
+    source.rows.extend(generate_responses(5, seed=2)[1:])
+
+    result = apply_new_responses(source, state, data)
+
+    assert result is not None
+    assert result == rebuild_scores(source)
+
+
+def test_apply_new_responses_without_new_rows_keeps_scores(scored):
+    source, data, state = scored
+    assert apply_new_responses(source, state, data) == (data, state)
+
+
+def test_apply_new_responses_rebuilds_after_an_edit(scored):
+    source, data, state = scored
+    source.rows[3] = [source.rows[3][0]] + ["Tidak"] * (len(source.rows[0]) - 1)
+    assert apply_new_responses(source, state, data) is None
+
+
+@pytest.mark.parametrize("row", [5, -1])
+def test_apply_new_responses_rebuilds_after_a_delete(scored, row):
+    source, data, state = scored
+    del source.rows[row]
+    assert apply_new_responses(source, state, data) is None
+
+
+def test_apply_new_responses_rebuilds_without_state(scored):
+    source, data, _ = scored
+    assert apply_new_responses(source, None, data) is None
+
+
+def test_unchanged_signature_skips_recalculation(scored):
+    source, data, state = scored
+    state = {**state, "signature": source.get_signature()}
+    assert is_unchanged(state, data, source.get_signature())
+
+    source.rows.extend(generate_responses(1, seed=3)[1:])
+    assert not is_unchanged(state, data, source.get_signature())
+    assert not is_unchanged(state, data, None)
@@ -21,4 +21,14 @@ api.interceptors.request.use(
   }
 )
 
+// Admin lists are keyset paginated: one page of rows and the cursor of the
+// next page, which the server sends in the X-Next-Cursor header
+export const getPage = async (url, params = {}) => {
+  const response = await api.get(url, { params })
+  return {
+    items: response.data,
+    nextCursor: response.headers['x-next-cursor'] || null,
+  }
+}
+
 export default api
\ No newline at end of file
@@ -1,12 +1,11 @@
-import api from './api';
+import api, { getPage } from './api';
 
 // Project API endpoints
 export const projectApi = {
-  // Get all projects
+  // Get one page of projects
   getProjects: async (params = {}) => {
     try {
-      const response = await api.get('/api/v1/admin/projects', { params });
-      return response.data;
+      return await getPage('/api/v1/admin/projects', params);
     } catch (error) {
       throw error;
     }
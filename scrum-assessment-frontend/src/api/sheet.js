@@ -1,12 +1,11 @@
-import api from './api';
+import api, { getPage } from './api';
 
 // Sheet API endpoints
 export const sheetApi = {
-  // Get all sheets
+  // Get one page of sheets
   getSheets: async (params = {}) => {
     try {
-      const response = await api.get('/api/v1/admin/sheets', { params });
-      return response.data;
+      return await getPage('/api/v1/admin/sheets', params);
     } catch (error) {
       throw error;
     }
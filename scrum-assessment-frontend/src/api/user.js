@@ -1,4 +1,4 @@
-import api from "./api.js";
+import api, { getPage } from "./api.js";
 
 export const getCurrentUser = async () => {
   const token = localStorage.getItem('access_token')
@@ -20,11 +20,10 @@ export const getCurrentUser = async () => {
 
 // User API endpoints
 export const userApi = {
-  // Get all users
+  // Get one page of users
   getUsers: async (params = {}) => {
     try {
-      const response = await api.get('/api/v1/admin/users', { params });
-      return response.data;
+      return await getPage('/api/v1/admin/users', params);
     } catch (error) {
       throw error;
     }
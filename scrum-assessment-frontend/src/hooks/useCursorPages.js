@@ -0,0 +1,77 @@
+import { useEffect, useRef, useState } from 'react'
+
+// Delay a fast-changing value, e.g. a search box, until it settles
+export const useDebouncedValue = (value, delay = 300) => {
+  const [debounced, setDebounced] = useState(value)
+
+  useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delay)
+    return () => clearTimeout(timer)
+  }, [value, delay])
+
+  return debounced
+}
+
+// Server-side search, sort and keyset paging of an admin table. `fetchPage`
+// resolves to { items, nextCursor }; `query` holds limit, sort, search and
+// filters, and a new query starts over from the first page.
+export const useCursorPages = (fetchPage, query) => {
+  const key = JSON.stringify(query)
+  const [queryKey, setQueryKey] = useState(key)
+  const [page, setPage] = useState(0)
+  const [reload, setReload] = useState(0)
+  const [items, setItems] = useState([])
+  const [hasNext, setHasNext] = useState(false)
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState(null)
+  // The server only returns the cursor of the next page, so the cursors of
+  // the pages already visited are kept to page back: cursors[n] loads page n
+  const cursors = useRef([null])
+
+  if (queryKey !== key) {
+    setQueryKey(key)
+    setPage(0)
+  }
+
+  useEffect(() => {
+    let cancelled = false
+    const cursor = cursors.current[page]
+    cursors.current = cursors.current.slice(0, page + 1)
+    setLoading(true)
+    setError(null)
+
+    fetchPage({ ...JSON.parse(key), ...(cursor ? { cursor } : {}) })
+      .then(({ items, nextCursor }) => {
+        if (cancelled) return
+        cursors.current[page + 1] = nextCursor
+        setItems(items)
+        setHasNext(!!nextCursor)
+      })
+      .catch((error) => {
+        if (cancelled) return
+        setItems([])
+        setHasNext(false)
+        setError(error)
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false)
+      })
+
+    return () => {
+      cancelled = true
+    }
+  }, [fetchPage, key, page, reload])
+
+  return {
+    items,
+    setItems,
+    page,
+    setPage,
+    // TablePagination shows "of more than" for a count of -1
+    count: hasNext ? -1 : page * query.limit + items.length,
+    loading,
+    error,
+    setError,
+    refresh: () => setReload((n) => n + 1),
+  }
+}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   Box,
@@ -33,49 +33,40 @@ import {
   Link as LinkIcon
 } from '@mui/icons-material';
 import { projectApi } from '../api/project';
+import { useCursorPages, useDebouncedValue } from '../hooks/useCursorPages';
 
 const ProjectListPage = () => {
   const navigate = useNavigate();
-  const [projects, setProjects] = useState([]);
-  const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [successMessage, setSuccessMessage] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [order, setOrder] = useState('asc');
   const [orderBy, setOrderBy] = useState('name');
-  const [page, setPage] = useState(0);
   const [rowsPerPage, setRowsPerPage] = useState(10);
+  const search = useDebouncedValue(searchTerm.trim());
 
-  // Fetch projects from API
-  const fetchProjects = async () => {
-    setLoading(true);
-    setError(null);
-    try {
-      const response = await projectApi.getProjects();
-      
-      // Your API returns a direct array of projects
-      if (Array.isArray(response)) {
-        setProjects(response);
-      } else {
-        console.warn('Unexpected API response format:', response);
-        setProjects([]);
-        setError('Unexpected data format received from server');
-      }
-    } catch (error) {
-      console.error('Failed to fetch projects:', error);
-      const errorMessage = error.response?.data?.detail || 
-                          error.response?.data?.message || 
-                          'Failed to load projects. Please try again.';
-      setError(errorMessage);
-      setProjects([]);
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    fetchProjects();
-  }, []);
+  // Search, sort and paging run on the server, one page at a time
+  const {
+    items: projects,
+    page,
+    setPage,
+    count,
+    loading,
+    error: loadError,
+    setError: setLoadError,
+    refresh: fetchProjects,
+  } = useCursorPages(projectApi.getProjects, {
+    limit: rowsPerPage,
+    sort: `${order === 'desc' ? '-' : ''}${orderBy}`,
+    search: search || undefined,
+    // The list only returns a summary unless extra fields are requested
+    fields: 'description,created_at,moderator,sheet',
+  });
+  const errorMessage = error || (loadError && (
+    loadError.response?.data?.detail ||
+    loadError.response?.data?.message ||
+    'Failed to load projects. Please try again.'
+  ));
 
   // Handle project deletion
   const handleDeleteProject = async (projectId) => {
@@ -83,12 +74,8 @@ const ProjectListPage = () => {
       try {
         await projectApi.deleteProject(projectId);
         
-        // Remove from local state
-        setProjects(prevProjects => 
-          Array.isArray(prevProjects) 
-            ? prevProjects.filter(project => project.id !== projectId)
-            : []
-        );
+        // Reload the page so it is filled from the next one
+        fetchProjects();
         
         setSuccessMessage('Project deleted successfully');
       } catch (error) {
@@ -115,57 +102,8 @@ const ProjectListPage = () => {
     setOrderBy(property);
   };
 
-  // Ensure projects is always an array before filtering
-  const filteredProjects = Array.isArray(projects) 
-    ? projects.filter(project => {
-        if (!project || typeof project !== 'object') return false;
-        
-        const searchableFields = ['name', 'description'];
-        return searchableFields.some(field => 
-          project[field] && 
-          project[field].toString().toLowerCase().includes(searchTerm.toLowerCase())
-        ) ||
-        // Search in moderator name
-        (project.moderator && (
-          project.moderator.username?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-          project.moderator.fullname?.toLowerCase().includes(searchTerm.toLowerCase())
-        )) ||
-        // Search in sheet filename
-        (project.sheet && project.sheet.sheet_filename?.toLowerCase().includes(searchTerm.toLowerCase()));
-      })
-    : [];
-
-  // Sort projects - handle nested objects
-  const sortedProjects = filteredProjects.sort((a, b) => {
-    let aValue, bValue;
-
-    if (orderBy === 'moderator') {
-      // Sort by moderator username
-      aValue = a.moderator?.username || '';
-      bValue = b.moderator?.username || '';
-    } else if (orderBy === 'sheet') {
-      // Sort by sheet filename
-      aValue = a.sheet?.sheet_filename || '';
-      bValue = b.sheet?.sheet_filename || '';
-    } else {
-      aValue = a[orderBy] || '';
-      bValue = b[orderBy] || '';
-    }
-    
-    if (aValue < bValue) {
-      return order === 'asc' ? -1 : 1;
-    }
-    if (aValue > bValue) {
-      return order === 'asc' ? 1 : -1;
-    }
-    return 0;
-  });
-
-  // Pagination
-  const paginatedProjects = sortedProjects.slice(
-    page * rowsPerPage,
-    page * rowsPerPage + rowsPerPage
-  );
+  // Columns the server can sort on
+  const sortableColumns = ['name', 'created_at'];
 
   // Helper functions for styling
   const getRoleColor = (role) => {
@@ -232,13 +170,16 @@ const ProjectListPage = () => {
       </Snackbar>
 
       {/* Error Alert */}
-      {error && (
+      {errorMessage && (
         <Alert 
           severity="error" 
           sx={{ mb: 3 }} 
-          onClose={() => setError(null)}
+          onClose={() => {
+            setError(null);
+            setLoadError(null);
+          }}
         >
-          {error}
+          {errorMessage}
         </Alert>
       )}
 
@@ -247,7 +188,7 @@ const ProjectListPage = () => {
         <TextField
           variant="outlined"
           size="small"
-          placeholder="Search projects by name, description, moderator, or sheet..."
+          placeholder="Search projects by name..."
           InputProps={{
             startAdornment: <SearchIcon sx={{ color: 'action.active', mr: 1 }} />
           }}
@@ -290,7 +231,7 @@ const ProjectListPage = () => {
                     align={headCell.align || 'left'}
                     sortDirection={orderBy === headCell.id ? order : false}
                   >
-                    {headCell.id !== 'actions' ? (
+                    {sortableColumns.includes(headCell.id) ? (
                       <TableSortLabel
                         active={orderBy === headCell.id}
                         direction={orderBy === headCell.id ? order : 'asc'}
@@ -312,14 +253,14 @@ const ProjectListPage = () => {
                     <CircularProgress />
                   </TableCell>
                 </TableRow>
-              ) : paginatedProjects.length === 0 ? (
+              ) : projects.length === 0 ? (
                 <TableRow>
                   <TableCell colSpan={6} align="center" sx={{ py: 4 }}>
                     {searchTerm ? 'No projects match your search' : 'No projects found'}
                   </TableCell>
                 </TableRow>
               ) : (
-                paginatedProjects.map((project) => (
+                projects.map((project) => (
                   <TableRow 
                     hover 
                     key={project.id}
@@ -437,7 +378,7 @@ const ProjectListPage = () => {
         <TablePagination
           rowsPerPageOptions={[5, 10, 25]}
           component="div"
-          count={filteredProjects.length}
+          count={count}
           rowsPerPage={rowsPerPage}
           page={page}
           onPageChange={(e, newPage) => setPage(newPage)}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   Box,
@@ -35,49 +35,38 @@ import {
   Cancel as CancelIcon
 } from '@mui/icons-material';
 import { sheetApi } from '../api/sheet';
+import { useCursorPages, useDebouncedValue } from '../hooks/useCursorPages';
 
 const SheetListPage = () => {
   const navigate = useNavigate();
-  const [sheets, setSheets] = useState([]);
-  const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [successMessage, setSuccessMessage] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [order, setOrder] = useState('asc');
   const [orderBy, setOrderBy] = useState('sheet_filename');
-  const [page, setPage] = useState(0);
   const [rowsPerPage, setRowsPerPage] = useState(10);
+  const search = useDebouncedValue(searchTerm.trim());
 
-  // Fetch sheets from API
-  const fetchSheets = async () => {
-    setLoading(true);
-    setError(null);
-    try {
-      const response = await sheetApi.getSheets();
-      
-      // Your API returns a direct array of sheets
-      if (Array.isArray(response)) {
-        setSheets(response);
-      } else {
-        console.warn('Unexpected API response format:', response);
-        setSheets([]);
-        setError('Unexpected data format received from server');
-      }
-    } catch (error) {
-      console.error('Failed to fetch sheets:', error);
-      const errorMessage = error.response?.data?.detail || 
-                          error.response?.data?.message || 
-                          'Failed to load sheets. Please try again.';
-      setError(errorMessage);
-      setSheets([]);
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    fetchSheets();
-  }, []);
+  // Search, sort and paging run on the server, one page at a time
+  const {
+    items: sheets,
+    page,
+    setPage,
+    count,
+    loading,
+    error: loadError,
+    setError: setLoadError,
+    refresh: fetchSheets,
+  } = useCursorPages(sheetApi.getSheets, {
+    limit: rowsPerPage,
+    sort: `${order === 'desc' ? '-' : ''}${orderBy}`,
+    search: search || undefined,
+  });
+  const errorMessage = error || (loadError && (
+    loadError.response?.data?.detail ||
+    loadError.response?.data?.message ||
+    'Failed to load sheets. Please try again.'
+  ));
 
   // Handle sheet deletion
   const handleDeleteSheet = async (sheetId) => {
@@ -85,12 +74,8 @@ const SheetListPage = () => {
       try {
         await sheetApi.deleteSheet(sheetId);
         
-        // Remove from local state
-        setSheets(prevSheets => 
-          Array.isArray(prevSheets) 
-            ? prevSheets.filter(sheet => sheet.id !== sheetId)
-            : []
-        );
+        // Reload the page so it is filled from the next one
+        fetchSheets();
         
         setSuccessMessage('Sheet deleted successfully');
       } catch (error) {
@@ -117,38 +102,8 @@ const SheetListPage = () => {
     setOrderBy(property);
   };
 
-  // Ensure sheets is always an array before filtering
-  const filteredSheets = Array.isArray(sheets) 
-    ? sheets.filter(sheet => {
-        if (!sheet || typeof sheet !== 'object') return false;
-        
-        const searchableFields = ['sheet_filename', 'description', 'form_link'];
-        return searchableFields.some(field => 
-          sheet[field] && 
-          sheet[field].toString().toLowerCase().includes(searchTerm.toLowerCase())
-        );
-      })
-    : [];
-
-  // Sort sheets
-  const sortedSheets = filteredSheets.sort((a, b) => {
-    const aValue = a[orderBy] || '';
-    const bValue = b[orderBy] || '';
-    
-    if (aValue < bValue) {
-      return order === 'asc' ? -1 : 1;
-    }
-    if (aValue > bValue) {
-      return order === 'asc' ? 1 : -1;
-    }
-    return 0;
-  });
-
-  // Pagination
-  const paginatedSheets = sortedSheets.slice(
-    page * rowsPerPage,
-    page * rowsPerPage + rowsPerPage
-  );
+  // Columns the server can sort on
+  const sortableColumns = ['sheet_filename', 'created_at'];
 
   // Status chip for fill form status
   const getStatusChip = (sheet) => (
@@ -209,13 +164,16 @@ const SheetListPage = () => {
       </Snackbar>
 
       {/* Error Alert */}
-      {error && (
+      {errorMessage && (
         <Alert 
           severity="error" 
           sx={{ mb: 3 }} 
-          onClose={() => setError(null)}
+          onClose={() => {
+            setError(null);
+            setLoadError(null);
+          }}
         >
-          {error}
+          {errorMessage}
         </Alert>
       )}
 
@@ -224,7 +182,7 @@ const SheetListPage = () => {
         <TextField
           variant="outlined"
           size="small"
-          placeholder="Search sheets by filename, description, or link..."
+          placeholder="Search sheets by filename..."
           InputProps={{
             startAdornment: <SearchIcon sx={{ color: 'action.active', mr: 1 }} />
           }}
@@ -268,7 +226,7 @@ const SheetListPage = () => {
                     align={headCell.align || 'left'}
                     sortDirection={orderBy === headCell.id ? order : false}
                   >
-                    {headCell.id !== 'actions' ? (
+                    {sortableColumns.includes(headCell.id) ? (
                       <TableSortLabel
                         active={orderBy === headCell.id}
                         direction={orderBy === headCell.id ? order : 'asc'}
@@ -290,14 +248,14 @@ const SheetListPage = () => {
                     <CircularProgress />
                   </TableCell>
                 </TableRow>
-              ) : paginatedSheets.length === 0 ? (
+              ) : sheets.length === 0 ? (
                 <TableRow>
                   <TableCell colSpan={7} align="center" sx={{ py: 4 }}>
                     {searchTerm ? 'No sheets match your search' : 'No sheets found'}
                   </TableCell>
                 </TableRow>
               ) : (
-                paginatedSheets.map((sheet) => (
+                sheets.map((sheet) => (
                   <TableRow hover key={sheet.id}>
                     <TableCell>
                       <Typography variant="subtitle1" fontWeight="medium">
@@ -368,7 +326,7 @@ const SheetListPage = () => {
         <TablePagination
           rowsPerPageOptions={[5, 10, 25]}
           component="div"
-          count={filteredSheets.length}
+          count={count}
           rowsPerPage={rowsPerPage}
           page={page}
           onPageChange={(e, newPage) => setPage(newPage)}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import {
   Box,
@@ -30,49 +30,39 @@ import {
   Add as AddIcon
 } from '@mui/icons-material';
 import { userApi } from '../api/user';
+import { useCursorPages, useDebouncedValue } from '../hooks/useCursorPages';
 
 const UserListPage = () => {
   const navigate = useNavigate();
-  const [users, setUsers] = useState([]);
-  const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [successMessage, setSuccessMessage] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [order, setOrder] = useState('asc');
   const [orderBy, setOrderBy] = useState('username');
-  const [page, setPage] = useState(0);
   const [rowsPerPage, setRowsPerPage] = useState(10);
+  const search = useDebouncedValue(searchTerm.trim());
 
-  // Fetch users from API
-  const fetchUsers = async () => {
-    setLoading(true);
-    setError(null);
-    try {
-      const response = await userApi.getUsers();
-      
-      // Your API returns a direct array of users
-      if (Array.isArray(response)) {
-        setUsers(response);
-      } else {
-        console.warn('Unexpected API response format:', response);
-        setUsers([]);
-        setError('Unexpected data format received from server');
-      }
-    } catch (error) {
-      console.error('Failed to fetch users:', error);
-      const errorMessage = error.response?.data?.detail || 
-                          error.response?.data?.message || 
-                          'Failed to load users. Please try again.';
-      setError(errorMessage);
-      setUsers([]);
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    fetchUsers();
-  }, []);
+  // Search, sort and paging run on the server, one page at a time
+  const {
+    items: users,
+    setItems: setUsers,
+    page,
+    setPage,
+    count,
+    loading,
+    error: loadError,
+    setError: setLoadError,
+    refresh: fetchUsers,
+  } = useCursorPages(userApi.getUsers, {
+    limit: rowsPerPage,
+    sort: `${order === 'desc' ? '-' : ''}${orderBy}`,
+    search: search || undefined,
+  });
+  const errorMessage = error || (loadError && (
+    loadError.response?.data?.detail ||
+    loadError.response?.data?.message ||
+    'Failed to load users. Please try again.'
+  ));
 
   // Handle user deletion
   const handleDeleteUser = async (userId) => {
@@ -80,12 +70,8 @@ const UserListPage = () => {
       try {
         await userApi.deleteUser(userId);
         
-        // Remove from local state
-        setUsers(prevUsers => 
-          Array.isArray(prevUsers) 
-            ? prevUsers.filter(user => user.id !== userId)
-            : []
-        );
+        // Reload the page so it is filled from the next one
+        fetchUsers();
         
         setSuccessMessage('User deleted successfully');
       } catch (error) {
@@ -144,51 +130,8 @@ const UserListPage = () => {
     setOrderBy(property);
   };
 
-  // Ensure users is always an array before filtering
-  const filteredUsers = Array.isArray(users) 
-    ? users.filter(user => {
-        if (!user || typeof user !== 'object') return false;
-        
-        const searchableFields = ['username', 'email', 'fullname', 'role'];
-        return searchableFields.some(field => {
-          if (field === 'role') {
-            // Search in role_name if role exists
-            return user.role && user.role.role_name && 
-                   user.role.role_name.toLowerCase().includes(searchTerm.toLowerCase());
-          }
-          return user[field] && 
-                 user[field].toString().toLowerCase().includes(searchTerm.toLowerCase());
-        });
-      })
-    : [];
-
-  // Sort users - handle nested role object
-  const sortedUsers = filteredUsers.sort((a, b) => {
-    let aValue, bValue;
-
-    if (orderBy === 'role') {
-      // Sort by role name
-      aValue = a.role?.role_name || '';
-      bValue = b.role?.role_name || '';
-    } else {
-      aValue = a[orderBy] || '';
-      bValue = b[orderBy] || '';
-    }
-    
-    if (aValue < bValue) {
-      return order === 'asc' ? -1 : 1;
-    }
-    if (aValue > bValue) {
-      return order === 'asc' ? 1 : -1;
-    }
-    return 0;
-  });
-
-  // Pagination
-  const paginatedUsers = sortedUsers.slice(
-    page * rowsPerPage,
-    page * rowsPerPage + rowsPerPage
-  );
+  // Columns the server can sort on
+  const sortableColumns = ['username', 'email', 'created_at'];
 
   // Helper functions for styling
   const getRoleColor = (role) => {
@@ -245,13 +188,16 @@ const UserListPage = () => {
       </Snackbar>
 
       {/* Error Alert */}
-      {error && (
+      {errorMessage && (
         <Alert 
           severity="error" 
           sx={{ mb: 3 }} 
-          onClose={() => setError(null)}
+          onClose={() => {
+            setError(null);
+            setLoadError(null);
+          }}
         >
-          {error}
+          {errorMessage}
         </Alert>
       )}
 
@@ -260,7 +206,7 @@ const UserListPage = () => {
         <TextField
           variant="outlined"
           size="small"
-          placeholder="Search users by username, email, fullname, or role..."
+          placeholder="Search users by username, email, or fullname..."
           InputProps={{
             startAdornment: <SearchIcon sx={{ color: 'action.active', mr: 1 }} />
           }}
@@ -302,7 +248,7 @@ const UserListPage = () => {
                     align={headCell.align || 'left'}
                     sortDirection={orderBy === headCell.id ? order : false}
                   >
-                    {headCell.id !== 'actions' ? (
+                    {sortableColumns.includes(headCell.id) ? (
                       <TableSortLabel
                         active={orderBy === headCell.id}
                         direction={orderBy === headCell.id ? order : 'asc'}
@@ -324,14 +270,14 @@ const UserListPage = () => {
                     <CircularProgress />
                   </TableCell>
                 </TableRow>
-              ) : paginatedUsers.length === 0 ? (
+              ) : users.length === 0 ? (
                 <TableRow>
                   <TableCell colSpan={6} align="center" sx={{ py: 4 }}>
                     {searchTerm ? 'No users match your search' : 'No users found'}
                   </TableCell>
                 </TableRow>
               ) : (
-                paginatedUsers.map((user) => (
+                users.map((user) => (
                   <TableRow 
                     hover 
                     key={user.id}
@@ -408,7 +354,7 @@ const UserListPage = () => {
         <TablePagination
           rowsPerPageOptions={[5, 10, 25]}
           component="div"
-          count={filteredUsers.length}
+          count={count}
           rowsPerPage={rowsPerPage}
           page={page}
           onPageChange={(e, newPage) => setPage(newPage)}